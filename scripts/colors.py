@@ -1,6 +1,8 @@
 # colors.py
 # BrickLink color IDs → human-readable names (from your provided list)
 
+from functools import lru_cache
+
 BRICKLINK_COLORS = {
     # Standard / Solid
     1: "White",
@@ -236,10 +238,11 @@ BRICKLINK_COLORS = {
 }
 
 
+@lru_cache(maxsize=None)
 def get_color_name(color_id):
     """
     Return human-friendly color name for a BrickLink color ID (int or str).
-    Returns None if not found.
+    Returns None if not found. Results are memoized since the table is static.
     """
     try:
         color_id_int = int(color_id)
@@ -1,5 +1,7 @@
 import os
 from google.oauth2.service_account import Credentials
+from google.auth.transport.requests import AuthorizedSession
+from requests.adapters import HTTPAdapter
 import gspread
 
 ORDERS_DIR = "orders"
@@ -10,6 +12,10 @@ GOOGLE_SHEET_NAME = "Minifig Profit Tool"
 CONFIG_TAB_NAME = "Config"
 LEFTOVERS_TAB_NAME = "Leftover Inventory"
 
+# Shared HTTP session settings for all Sheets/Drive calls
+HTTP_POOL_SIZE = 8
+HTTP_TIMEOUT = 60
+
 def load_google_sheet():
     # Load or create the main Google Sheet for the tool.
     creds = Credentials.from_service_account_file(
@@ -19,18 +25,49 @@ def load_google_sheet():
             "https://www.googleapis.com/auth/drive"
         ]
     )
-    client = gspread.authorize(creds)
+    # One keep-alive session for every gspread call so requests reuse the
+    # same TLS connections instead of handshaking per call.
+    session = AuthorizedSession(creds)
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    client = gspread.authorize(creds, session=session)
+    client.set_timeout(HTTP_TIMEOUT)
     try:
         return client.open(GOOGLE_SHEET_NAME)
     except gspread.SpreadsheetNotFound:
         return client.create(GOOGLE_SHEET_NAME)
 
+# Worksheet handles per (spreadsheet id, tab name); looking a tab up by name
+# costs a spreadsheet metadata request, so each tab is resolved once per run
+_WORKSHEETS = {}
+
+def cache_worksheets(sheet):
+    # Resolve every existing tab with a single metadata request.
+    for ws in sheet.worksheets():
+        _WORKSHEETS[(sheet.id, ws.title)] = ws
+
+def get_worksheet(sheet, name):
+    # Get an existing worksheet by name; raises WorksheetNotFound if it doesn't exist.
+    key = (sheet.id, name)
+    ws = _WORKSHEETS.get(key)
+    if ws is None:
+        ws = sheet.worksheet(name)
+        _WORKSHEETS[key] = ws
+    return ws
+
 def get_or_create_worksheet(sheet, name, rows=100, cols=20):
     # Get a worksheet by name, or create it if it doesn't exist.
     try:
-        return sheet.worksheet(name)
+        return get_worksheet(sheet, name)
     except gspread.exceptions.WorksheetNotFound:
-        return sheet.add_worksheet(title=name, rows=str(rows), cols=str(cols))
+        ws = sheet.add_worksheet(title=name, rows=str(rows), cols=str(cols))
+        _WORKSHEETS[(sheet.id, name)] = ws
+        return ws
+
+def forget_worksheet(sheet, name):
+    # Drop a cached handle whose properties are stale (e.g. after a resize);
+    # the next lookup resolves the tab again.
+    _WORKSHEETS.pop((sheet.id, name), None)
 
 def get_config_value(sheet, label, cell):
     # Get a configuration value from the config worksheet, prompting the user if missing.
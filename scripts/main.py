@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from config import load_google_sheet
 from orders import load_orders
 from wanted_lists import parse_wanted_lists
@@ -8,6 +9,7 @@ from sheets import (
     update_leftovers,
     update_orders_sheet,
     read_orders_sheet_edits,
+    prefetch_sheet_reads,
     detect_changes_before_merge,
     apply_saved_changes_to_files
 )
@@ -21,6 +23,10 @@ def main():
     
     # Load or create the main Google Sheet first
     sheet = load_google_sheet()
+
+    # Fetch the Orders, Summary and inventory tabs in parallel up front;
+    # the reads below and in the worksheet updates are served from the cache
+    prefetch_sheet_reads(sheet)
     
     # Read current sheet edits before merging new orders
     sheet_edits = read_orders_sheet_edits(sheet)
@@ -38,8 +44,9 @@ def main():
     # Load inventory (list[OrderItem]) and orders (list[Order])
     inv_list, orders_list = load_orders()
 
-    # Update the Inventory worksheet with the current inventory (pre-build)
-    update_inventory_sheet(sheet, inv_list)
+    # Keep the pre-build inventory for the Inventory worksheet
+    # (determine_buildable works on a copy, so these items are not consumed)
+    inventory_items = inv_list
 
     # Use object-based wanted lists for build logic
     wanted_lists = parse_wanted_lists()
@@ -53,12 +60,21 @@ def main():
         avg_cost = round(cost / count, 2) if count else 0.0
         summary_rows.append([wl.title, count, avg_cost, "", "", "", "", "", "", "", ""])
 
-    # Update the Summary worksheet with build results and formulas
-    update_summary(sheet, summary_rows)
-    # Update the Leftover Inventory worksheet with remaining inventory (post-build)
-    update_leftovers(sheet, inv_list)
-    # Update the Orders worksheet with all order and item rows
-    update_orders_sheet(sheet, orders_list)
+    # Each worksheet update writes its own tab, so run them concurrently and
+    # overlap their HTTP round trips
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [
+            # Inventory worksheet with the current inventory (pre-build)
+            pool.submit(update_inventory_sheet, sheet, inventory_items),
+            # Summary worksheet with build results and formulas
+            pool.submit(update_summary, sheet, summary_rows),
+            # Leftover Inventory worksheet with remaining inventory (post-build)
+            pool.submit(update_leftovers, sheet, inv_list),
+            # Orders worksheet with all order and item rows
+            pool.submit(update_orders_sheet, sheet, orders_list),
+        ]
+        for future in futures:
+            future.result()
 
 if __name__ == "__main__":
     # Run the main function if this script is executed directly
@@ -5,11 +5,11 @@ Merges multiple orders XML/CSV into canonical orders.xml/orders.csv
 
 import os
 import csv
-import xml.etree.ElementTree as ET
 from datetime import datetime
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any
 from orders import Order, OrderItem  # use shared classes
+from order_xml import ET, write_order_xml
 
 # Import ORDERS_DIR from config if available, otherwise use default
 try:
@@ -87,16 +87,10 @@ def merge_xml():
         reverse=True
     )
 
-    # Build XML tree
-    root = ET.Element('ORDERS')
-    for order in sorted_orders:
-        root.append(order.to_xml_element())
-
-    # Write merged XML file
-    tree = ET.ElementTree(root)
-    ET.indent(tree, space="  ", level=0)
+    # Write merged XML file one order at a time instead of building the whole
+    # tree, in the same format sheets.py uses when it rewrites the file
     output_path = os.path.join(ORDERS_DIR, 'orders.xml')
-    tree.write(output_path, encoding='utf-8', xml_declaration=True)
+    write_order_xml(output_path, (order.to_xml_element() for order in sorted_orders))
 
     print(f"Merged {len(sorted_orders)} unique orders into orders.xml")
 
@@ -196,7 +190,8 @@ def merge_csv():
     # Sort orders by date desc then by Order ID for stability
     sorted_order_ids = sorted(orders_map.keys(), key=lambda oid: (orders_map[oid].date, oid), reverse=True)
 
-    final_rows: List[Dict[str, Any]] = []
+    # Rows are built as lists in header order for csv.writer (no DictWriter per-row checks)
+    final_rows: List[List[Any]] = []
     total_items = 0
     for oid in sorted_order_ids:
         entry = orders_map[oid]
@@ -204,20 +199,18 @@ def merge_csv():
             # Skip orders without a header row
             continue
         # Normalize header row to headers
-        header_row = {k: entry.header.get(k, '') for k in headers}
-        final_rows.append(header_row)
+        final_rows.append([entry.header.get(k, '') for k in headers])
         # Append items in insertion order
         for it in entry.items.values():
             row = it['row']
-            row_clean = {k: row.get(k, '') for k in headers}
-            final_rows.append(row_clean)
+            final_rows.append([row.get(k, '') for k in headers])
             total_items += 1
 
     # Write merged CSV
     output_path = os.path.join(ORDERS_DIR, 'orders.csv')
     with open(output_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        writer.writeheader()
+        writer = csv.writer(f)
+        writer.writerow(headers)
         writer.writerows(final_rows)
 
     print(f"Merged {len(sorted_order_ids)} orders with {total_items} items into orders.csv")
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Shared XML backend and serializer for the order files, so merging, sheet
+edits and deletions all write byte-identical orders.xml output.
+"""
+
+from typing import Iterable, Iterator, Tuple
+
+# Prefer lxml (C parser/serializer) when available; the API used here is shared
+try:
+    from lxml import etree as ET
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
+
+# Written ahead of every order XML file
+XML_DECLARATION = b"<?xml version='1.0' encoding='UTF-8'?>\n"
+
+
+def iterparse(filepath: str):
+    """iterparse an order XML file with start, end and comment events; comments stay in the tree."""
+    events = ("start", "end", "comment")
+    if HAS_LXML:
+        return ET.iterparse(filepath, events=events)
+    parser = ET.XMLParser(target=ET.TreeBuilder(insert_comments=True))
+    return ET.iterparse(filepath, events=events, parser=parser)
+
+
+def iter_orders(filepath: str) -> Iterator:
+    """Yield the ORDER elements directly under the root of an order XML file as they are parsed.
+
+    Each order is dropped from the tree once the caller moves on, so only one
+    order is held in memory; for read-only passes over the files.
+    """
+    root = None
+    depth = 0
+    for event, elem in iterparse(filepath):
+        if event == "comment":
+            continue
+        if event == "start":
+            if root is None:
+                root = elem
+            depth += 1
+            continue
+        depth -= 1
+        if depth == 1:
+            if elem.tag == "ORDER":
+                yield elem
+            root.clear()
+
+
+def root_tags(root) -> Tuple[bytes, bytes]:
+    """Serialize the start and end tags of root, with its attributes and namespaces."""
+    if HAS_LXML:
+        shell = ET.Element(root.tag, dict(root.attrib), nsmap=root.nsmap)
+    else:
+        shell = ET.Element(root.tag, dict(root.attrib))
+    shell.text = "\n"
+    data = ET.tostring(shell, encoding="utf-8", xml_declaration=False)
+    split = data.rindex(b"</")
+    return data[:split], data[split:] + b"\n"
+
+
+def serialize_child(elem) -> bytes:
+    """Serialize one child of the root (element or comment) on its own lines, indented by two spaces."""
+    elem.tail = None
+    # Comments and processing instructions have a factory function as their tag
+    if isinstance(elem.tag, str):
+        ET.indent(elem, space="  ", level=1)
+    return b"  " + ET.tostring(elem, encoding="utf-8", xml_declaration=False) + b"\n"
+
+
+def write_order_xml(filepath: str, children: Iterable, root=None) -> None:
+    """Write children as an order XML file under root's tags (<ORDERS> by default).
+
+    With lxml, comments before and after a parsed root are kept as well.
+    """
+    if root is None:
+        root = ET.Element("ORDERS")
+    start_tag, end_tag = root_tags(root)
+    prolog, epilog = _root_siblings(root)
+    with open(filepath, 'wb') as fout:
+        fout.write(XML_DECLARATION)
+        for node in prolog:
+            fout.write(serialize_top_level(node))
+        fout.write(start_tag)
+        for child in children:
+            fout.write(serialize_child(child))
+        fout.write(end_tag)
+        for node in epilog:
+            fout.write(serialize_top_level(node))
+
+
+def _root_siblings(root) -> Tuple[list, list]:
+    """Return the nodes before and after root in its document (only lxml keeps them)."""
+    if not HAS_LXML:
+        return [], []
+    return list(reversed(list(root.itersiblings(preceding=True)))), list(root.itersiblings())
+
+
+def serialize_top_level(node) -> bytes:
+    """Serialize a comment/PI outside the root on its own line."""
+    node.tail = None
+    return ET.tostring(node, encoding="utf-8", xml_declaration=False) + b"\n"
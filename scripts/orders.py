@@ -1,14 +1,14 @@
 import os
 import re
 import csv
-import xml.etree.ElementTree as ET
 from config import ORDERS_DIR
 from dataclasses import dataclass, field
 from typing import List, Dict, Tuple, Optional
 from colors import get_color_name
+from order_xml import ET, iter_orders, write_order_xml
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderItem:
     item_id: str
     item_type: str
@@ -113,13 +113,16 @@ class Order:
 
 # --- helpers ---
 
+# Currency symbols and thousands separators removed before float()
+_MONEY_DELETE = str.maketrans("", "", "$,")
+
 def _parse_money(val: Optional[str]) -> float:
     """Parse money string to float."""
     if not val:
         return 0.0
-    cleaned = val.strip().replace("$", "").replace(",", "")
+    # float() ignores surrounding whitespace and rejects blanks
     try:
-        return float(cleaned) if cleaned else 0.0
+        return float(val.translate(_MONEY_DELETE))
     except ValueError:
         return 0.0
 
@@ -161,13 +164,15 @@ def _build_xml_indexes() -> Tuple[Dict[Tuple[str, str], int], Dict[Tuple[str, st
 
     for filename in xml_files:
         filepath = os.path.join(ORDERS_DIR, filename)
+        # Index each file separately so a parse error part-way through adds nothing
+        file_colors, file_notes = {}, {}
         try:
-            tree = ET.parse(filepath)
-            for order_elem in tree.getroot().findall("ORDER"):
+            # Stream the file one ORDER at a time; each is dropped once indexed
+            for order_elem in iter_orders(filepath):
                 order_id = (order_elem.findtext("ORDERID") or "").strip()
                 if not order_id:
                     continue
-                    
+
                 for item_elem in order_elem.findall("ITEM"):
                     lot_id = (item_elem.findtext("LOTID") or "").strip()
                     if not lot_id:
@@ -177,17 +182,18 @@ def _build_xml_indexes() -> Tuple[Dict[Tuple[str, str], int], Dict[Tuple[str, st
                     
                     # Store color ID
                     try:
-                        color_index[key] = int(item_elem.findtext("COLOR", "0") or 0)
+                        file_colors[key] = int(item_elem.findtext("COLOR", "0") or 0)
                     except ValueError:
-                        color_index[key] = 0
+                        file_colors[key] = 0
                         
                     # Store seller note
                     note = (item_elem.findtext("DESCRIPTION") or "").strip()
                     if note:
-                        seller_note_index[key] = note
-                        
-        except (ET.ParseError, Exception):
+                        file_notes[key] = note
+        except (OSError, ET.ParseError):
             continue
+        color_index.update(file_colors)
+        seller_note_index.update(file_notes)
 
     return color_index, seller_note_index
 
@@ -211,9 +217,7 @@ def write_minimal_orders_xml(orders: List[Order], output_path: str) -> None:
                 if item.description and item.description.strip():
                     ET.SubElement(item_elem, "DESCRIPTION").text = item.description
                 
-    tree = ET.ElementTree(root)
-    ET.indent(tree, space="  ", level=0)
-    tree.write(output_path, encoding="utf-8", xml_declaration=True)
+    write_order_xml(output_path, list(root), root)
 
 
 def load_orders() -> Tuple[List[OrderItem], List[Order]]:
@@ -1,10 +1,23 @@
 import gspread
 import os
 import csv
-import xml.etree.ElementTree as ET
-from collections import defaultdict
+import itertools
+import math
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
-from config import get_or_create_worksheet, LEFTOVERS_TAB_NAME
+from config import (
+    cache_worksheets, forget_worksheet, get_or_create_worksheet, get_worksheet, LEFTOVERS_TAB_NAME,
+)
+
+from order_xml import (
+    ET, HAS_LXML as _HAS_LXML, XML_DECLARATION, iter_orders, iterparse, root_tags,
+    serialize_child, serialize_top_level, write_order_xml,
+)
 
 # Constants
 INVENTORY_HEADERS = ["Item ID", "Description", "Color", "Qty", "Total Cost", "Unit Cost"]
@@ -12,6 +25,18 @@ SUMMARY_HEADERS = [
     "Minifig ID", "Buildable", "Avg Cost", "Price", "Profit", "Margin", "Markup",
     "75%", "100%", "125%", "150%"
 ]
+_PERCENT_FORMAT = {"type": "PERCENT", "pattern": "##0.00%"}
+_CURRENCY_FORMAT = {"type": "CURRENCY", "pattern": "$#,##0.00"}
+# Summary formula columns: (column, formula for row 2, number format)
+SUMMARY_FORMULAS = [
+    ("E", "=ROUND((D2 * 0.85) - C2 - Config!$B$1 - Config!$B$2, 2)", None),
+    ("F", "=IF(D2=0, \"\", ROUND(E2 / D2, 2))", _PERCENT_FORMAT),
+    ("G", "=IF(C2=0, \"\", ROUND(E2 / C2, 2))", _PERCENT_FORMAT),
+    ("H", "=CEILING(((D2 * 0.85) - (Config!$B$1 + Config!$B$2)) / 1.75, 0.25)", _CURRENCY_FORMAT),
+    ("I", "=CEILING(((D2 * 0.85) - (Config!$B$1 + Config!$B$2)) / 2.0, 0.25)", _CURRENCY_FORMAT),
+    ("J", "=CEILING(((D2 * 0.85) - (Config!$B$1 + Config!$B$2)) / 2.25, 0.25)", _CURRENCY_FORMAT),
+    ("K", "=CEILING(((D2 * 0.85) - (Config!$B$1 + Config!$B$2)) / 2.5, 0.25)", _CURRENCY_FORMAT),
+]
 ORDERS_HEADERS = [
     "Order ID","Seller","Order Date","Shipping","Add Chrg 1","Order Total","Base Grand Total","Total Lots","Total Items","Tracking No","Condition","Item Number","Item Description","Color","Qty","Each","Total"
 ]
@@ -19,115 +44,402 @@ ORDER_LEVEL_FIELDS = [
     "Order ID", "Seller", "Order Date", "Shipping", "Add Chrg 1",
     "Order Total", "Base Grand Total", "Total Lots", "Total Items", "Tracking No"
 ]
+ORDERS_COLUMN_INDEX = {header: i for i, header in enumerate(ORDERS_HEADERS)}
+# Order-level columns come first in ORDERS_HEADERS; item columns start here
+_FIRST_ITEM_COLUMN = len(ORDER_LEVEL_FIELDS)
+# Column letters by zero-based index, one per column of the widest sheet we write
+_COL_LETTERS = [
+    gspread.utils.rowcol_to_a1(1, i + 1)[:-1]
+    for i in range(max(len(INVENTORY_HEADERS), len(SUMMARY_HEADERS), len(ORDERS_HEADERS)))
+]
+# Data rows of the Orders sheet (below the header, only the columns we write)
+_ORDERS_DATA_RANGE = f"A2:{_COL_LETTERS[len(ORDERS_HEADERS) - 1]}"
+
+# Sheets API statuses worth retrying: quota exhaustion and transient server errors
+_RETRY_STATUSES = (429, 500, 503)
+_MAX_RETRIES = 5
+
+def _with_backoff(fn, *args, **kwargs):
+    """Call fn, retrying rate-limit and transient errors with truncated exponential backoff."""
+    for attempt in range(_MAX_RETRIES + 1):
+        try:
+            return fn(*args, **kwargs)
+        except gspread.exceptions.APIError as e:
+            if e.response.status_code not in _RETRY_STATUSES or attempt == _MAX_RETRIES:
+                raise
+            time.sleep(min(2 ** attempt + random.random(), 32))
+
+# Upper bound on threads rewriting order files at once
+_MAX_FILE_WORKERS = 8
+
+# Per-file errors that skip an order file: I/O, malformed CSV/XML, missing columns
+_FILE_ERRORS = (OSError, csv.Error, ET.ParseError, ValueError)
+
+# Read/write buffer for streamed CSV rewrites (fewer read/write syscalls than the 8 KiB default)
+_CSV_BUFFER_BYTES = 1 << 20
+
+# Keep each batchUpdate body under the ~2 MB guideline by writing large grids in row chunks
+_MAX_BATCH_BYTES = 1_500_000
+_WRITE_CHUNK_ROWS = 1000
+_CELL_JSON_OVERHEAD = 40
+
+# Reads younger than this are reused without checking the spreadsheet revision
+READ_CACHE_TTL_SECONDS = 30
+
+# Last read per (spreadsheet id, tab, read) -> (file revision, fetch time, result)
+_READ_CACHE: Dict[Tuple[Any, str, str], Tuple[Any, float, Any]] = {}
+
+def _read_cached(sheet, ws, label: str, fetch):
+    """Return fetch(), reusing the previous result while it is still current.
+
+    Results younger than READ_CACHE_TTL_SECONDS are returned directly; older
+    ones are reused while the spreadsheet revision is unchanged, which costs a
+    single Drive metadata request instead of downloading a large worksheet.
+    Cached results are shared and must not be mutated by callers.
+    """
+    key = (sheet.id, ws.title, label)
+    cached = _READ_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[1] < READ_CACHE_TTL_SECONDS:
+        return cached[2]
+    revision = _with_backoff(sheet.get_lastUpdateTime)
+    if cached is not None and cached[0] == revision:
+        _READ_CACHE[key] = (revision, time.monotonic(), cached[2])
+        return cached[2]
+    result = _with_backoff(fetch)
+    _READ_CACHE[key] = (revision, time.monotonic(), result)
+    return result
+
+def _invalidate_reads(sheet, ws) -> None:
+    """Drop cached reads of a worksheet after writing to it."""
+    # Snapshot the keys: other worksheet updates may run in parallel threads
+    for key in [k for k in list(_READ_CACHE) if k[:2] == (sheet.id, ws.title)]:
+        _READ_CACHE.pop(key, None)
+
+def _read_summary_prices(sheet, ws) -> List[List[Any]]:
+    """Read Summary columns A-D column-major, with unformatted prices (cached)."""
+    return _read_cached(sheet, ws, "prices", lambda: ws.get(
+        "A2:D", major_dimension="COLUMNS", value_render_option="UNFORMATTED_VALUE"))
+
+def _read_inventory_values(sheet, ws) -> List[List[Any]]:
+    """Read the unformatted values of an inventory-style tab, header included (cached)."""
+    return _read_cached(sheet, ws, "values", lambda: ws.get(
+        f"A1:{_COL_LETTERS[len(INVENTORY_HEADERS) - 1]}", value_render_option="UNFORMATTED_VALUE"))
+
+def _read_orders_rows(sheet, ws) -> List[List[Any]]:
+    """Read the Orders data rows as unformatted row lists (cached).
+
+    Numbers come back as numbers, so re-writing them keeps them numeric.
+    """
+    return _read_cached(sheet, ws, "rows", lambda: ws.get(
+        _ORDERS_DATA_RANGE, value_render_option="UNFORMATTED_VALUE"))
+
+# Tabs read during a sync and the reader for each
+_PREFETCH_READS = [
+    ("Orders", _read_orders_rows),
+    ("Summary", _read_summary_prices),
+    ("Inventory", _read_inventory_values),
+    (LEFTOVERS_TAB_NAME, _read_inventory_values),
+]
+
+# Failures a prefetch may skip; anything else is a bug and propagates
+_PREFETCH_ERRORS = (gspread.exceptions.APIError, gspread.exceptions.WorksheetNotFound)
+
+def prefetch_sheet_reads(sheet) -> None:
+    """Fetch every tab the sync reads concurrently, so the later reads hit the cache.
+
+    Best effort: missing tabs are left for the update path to create, and an
+    API error only skips that prefetch, so the later read retries and reports it.
+    """
+    def prefetch(tab_name, read):
+        try:
+            read(sheet, get_worksheet(sheet, tab_name))
+        except _PREFETCH_ERRORS:
+            pass
+
+    # One metadata request resolves every existing tab for the reads below
+    try:
+        cache_worksheets(sheet)
+    except gspread.exceptions.APIError:
+        return
+    with ThreadPoolExecutor(max_workers=len(_PREFETCH_READS)) as executor:
+        list(executor.map(lambda args: prefetch(*args), _PREFETCH_READS))
+
+# Strings USER_ENTERED parses as plain numbers: optional sign and "$", optional
+# thousands separators in groups of three, optional decimals
+_NUMERIC_TEXT = re.compile(r"-?\$?(?:\d{1,3}(?:,\d{3})*|\d+)(?:\.\d+)?")
+
+def _cell_data(value, user_entered: bool = False) -> Dict[str, Any]:
+    """Convert a Python value to a Sheets CellData entry.
+
+    RAW semantics by default. With user_entered=True, strings starting with
+    "=" become formulas and numeric strings become numbers, mirroring the
+    USER_ENTERED value input option.
+    """
+    if value is None or value == "":
+        return {}
+    if isinstance(value, bool):
+        return {"userEnteredValue": {"boolValue": value}}
+    # NaN and infinity are not valid JSON numbers, so they are sent as text
+    if isinstance(value, int) or (isinstance(value, float) and math.isfinite(value)):
+        return {"userEnteredValue": {"numberValue": value}}
+    value = str(value)
+    if user_entered:
+        if value.startswith("="):
+            return {"userEnteredValue": {"formulaValue": value}}
+        if _NUMERIC_TEXT.fullmatch(value):
+            return {"userEnteredValue": {"numberValue": float(value.translate(_MONEY_DELETE))}}
+    return {"userEnteredValue": {"stringValue": value}}
+
+def _write_rows_request(ws, values: List[List[Any]], start_row: int = 0,
+                        user_entered: bool = False) -> Dict[str, Any]:
+    """Build an updateCells request writing values starting at column A."""
+    return {"updateCells": {
+        "rows": [{"values": [_cell_data(v, user_entered) for v in row]} for row in values],
+        "fields": "userEnteredValue",
+        "start": {"sheetId": ws.id, "rowIndex": start_row, "columnIndex": 0},
+    }}
+
+def _chunked_write_requests(ws, values: List[List[Any]], user_entered: bool = False,
+                            start_row: int = 0) -> List[Dict[str, Any]]:
+    """Build updateCells requests for values, split into row chunks if the payload is large.
+
+    Sheets recommends keeping request bodies under about 2 MB; the estimate
+    counts each cell's text plus a fixed allowance for its CellData JSON.
+    """
+    approx_bytes = sum(len(str(v)) + _CELL_JSON_OVERHEAD for row in values for v in row)
+    if approx_bytes <= _MAX_BATCH_BYTES:
+        return [_write_rows_request(ws, values, start_row=start_row, user_entered=user_entered)]
+    return [
+        _write_rows_request(ws, values[start:start + _WRITE_CHUNK_ROWS], start_row=start_row + start,
+                            user_entered=user_entered)
+        for start in range(0, len(values), _WRITE_CHUNK_ROWS)
+    ]
+
+def _changed_span(values: List[List[Any]], existing: List[List[Any]]) -> Optional[Tuple[int, int]]:
+    """Return the (first, end) row span where values differ from existing, or None.
+
+    existing is an unformatted ws.get() grid, where trailing blank cells and
+    rows are omitted; rows past the end of values are not part of the span.
+    """
+    def normalize(row, width):
+        row = ["" if v is None else v for v in row]
+        return row + [""] * (width - len(row))
+
+    changed = [
+        i for i, row in enumerate(values)
+        if i >= len(existing) or normalize(existing[i], len(row)) != normalize(row, len(row))
+    ]
+    return (changed[0], changed[-1] + 1) if changed else None
+
+def _send_batches(sheet, before: List[Dict[str, Any]], writes: List[Dict[str, Any]],
+                  after: List[Dict[str, Any]]) -> None:
+    """Send before + writes + after, one spreadsheets.batchUpdate per write chunk.
+
+    With a single write chunk this is one round trip; split writes go out in
+    order, with the setup requests in the first call and the rest in the last.
+    """
+    batches = [[write] for write in writes] or [[]]
+    batches[0] = before + batches[0]
+    batches[-1] = batches[-1] + after
+    for batch in batches:
+        _with_backoff(sheet.batch_update, {"requests": batch})
+
+def _clear_values_request(ws, start_row: int = 0, end_row: Optional[int] = None,
+                          start_col: int = 0) -> Dict[str, Any]:
+    """Build an updateCells request clearing values (formatting is kept).
+
+    Clears from start_row down (up to end_row if given) and from start_col to
+    the right edge of the sheet.
+    """
+    grid_range = {"sheetId": ws.id}
+    if start_row:
+        grid_range["startRowIndex"] = start_row
+    if end_row is not None:
+        grid_range["endRowIndex"] = end_row
+    if start_col:
+        grid_range["startColumnIndex"] = start_col
+    return {"updateCells": {"range": grid_range, "fields": "userEnteredValue"}}
+
+def _grid_resize_request(ws, rows: int, cols: int) -> Optional[Dict[str, Any]]:
+    """Build a request growing the grid to fit rows x cols, or None if it fits."""
+    if rows <= ws.row_count and cols <= ws.col_count:
+        return None
+    return {"updateSheetProperties": {
+        "properties": {"sheetId": ws.id, "gridProperties": {
+            "rowCount": max(rows, ws.row_count), "columnCount": max(cols, ws.col_count),
+        }},
+        "fields": "gridProperties(rowCount,columnCount)",
+    }}
+
+def _forget_resized_worksheet(sheet, ws, resize: Optional[Dict[str, Any]]) -> None:
+    """Drop the cached handle after a resize, so its stale grid size is not reused."""
+    if resize:
+        forget_worksheet(sheet, ws.title)
+
+def _repeat_cell_request(ws, a1_range: str, cell: Dict[str, Any], fields: str) -> Dict[str, Any]:
+    """Build a repeatCell request copying one CellData across an A1 range."""
+    return {"repeatCell": {
+        "range": gspread.utils.a1_range_to_grid_range(a1_range, ws.id),
+        "cell": cell,
+        "fields": fields,
+    }}
+
+def _number_format_request(ws, a1_range: str, format_type: str, pattern: str) -> Dict[str, Any]:
+    """Build a repeatCell request applying a number format to an A1 range."""
+    return _repeat_cell_request(
+        ws, a1_range,
+        {"userEnteredFormat": {"numberFormat": {"type": format_type, "pattern": pattern}}},
+        "userEnteredFormat.numberFormat",
+    )
+
+def _formula_column_request(ws, a1_range: str, formula: str,
+                            number_format: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Build a repeatCell request filling a range with one formula (and optional format).
+
+    The formula is written for the first cell of the range; Sheets shifts its
+    relative references for every following row, so the payload does not grow
+    with the number of rows.
+    """
+    cell = {"userEnteredValue": {"formulaValue": formula}}
+    fields = "userEnteredValue"
+    if number_format:
+        cell["userEnteredFormat"] = {"numberFormat": number_format}
+        fields += ",userEnteredFormat.numberFormat"
+    return _repeat_cell_request(ws, a1_range, cell, fields)
+
+def _currency_format_requests(ws, headers: List[str], columns: List[str], last_row: int) -> List[Dict[str, Any]]:
+    """Build repeatCell requests formatting the specified columns as currency.
+
+    Adjacent columns are merged into one range, so each run of neighbouring
+    currency columns costs a single request.
+    """
+    indices = sorted(headers.index(col) for col in set(columns) if col in headers)
+    runs = []
+    for col_idx in indices:
+        if runs and runs[-1][1] == col_idx - 1:
+            runs[-1][1] = col_idx
+        else:
+            runs.append([col_idx, col_idx])
+    return [
+        _number_format_request(
+            ws, f"{_COL_LETTERS[first]}2:{_COL_LETTERS[last]}{last_row}",
+            _CURRENCY_FORMAT["type"], _CURRENCY_FORMAT["pattern"]
+        )
+        for first, last in runs
+    ]
 
 def update_summary(sheet, summary_rows: List[List[Any]]) -> None:
     """Updates the 'Summary' worksheet with summary data and formulas."""
     ws = get_or_create_worksheet(sheet, "Summary")
-    existing = ws.get_all_records()
-    
-    # Map existing minifig IDs to their prices
-    existing_prices = {
-        row['Minifig ID']: row.get('Price') 
-        for row in existing if 'Minifig ID' in row
-    }
-    
-    # Write headers and preserve existing prices
-    ws.update(values=[SUMMARY_HEADERS], range_name="A1")
+
+    # Map existing minifig IDs to their prices (only columns A and D are needed);
+    # unformatted values skip the server-side display formatting of the prices
+    columns = _read_summary_prices(sheet, ws)
+    ids = columns[0] if columns else []
+    prices = columns[3] if len(columns) > 3 else []
+    existing_prices = dict(zip(ids, prices))
     
-    for i, row in enumerate(summary_rows, start=2):
-        title = row[0]
-        existing_price = existing_prices.get(title)
+    # Preserve existing prices
+    for row in summary_rows:
+        existing_price = existing_prices.get(row[0])
         row[3] = (existing_price if existing_price is not None 
                  and str(existing_price).strip() else "=14.99")
-    
-    ws.update(values=summary_rows, range_name="A2", value_input_option="USER_ENTERED")
-    
-    # Generate formula cells
-    row_count = len(summary_rows)
-    formula_cells = []
-    
-    for i in range(row_count):
-        row_num = i + 2
-        formula_cells.extend([
-            gspread.Cell(row_num, 5, f"=ROUND((D{row_num} * 0.85) - C{row_num} - Config!$B$1 - Config!$B$2, 2)"),
-            gspread.Cell(row_num, 6, f"=IF(D{row_num}=0, \"\", ROUND(E{row_num} / D{row_num}, 2))"),
-            gspread.Cell(row_num, 7, f"=IF(C{row_num}=0, \"\", ROUND(E{row_num} / C{row_num}, 2))"),
-            gspread.Cell(row_num, 8, f"=CEILING(((D{row_num} * 0.85) - (Config!$B$1 + Config!$B$2)) / 1.75, 0.25)"),
-            gspread.Cell(row_num, 9, f"=CEILING(((D{row_num} * 0.85) - (Config!$B$1 + Config!$B$2)) / 2.0, 0.25)"),
-            gspread.Cell(row_num, 10, f"=CEILING(((D{row_num} * 0.85) - (Config!$B$1 + Config!$B$2)) / 2.25, 0.25)"),
-            gspread.Cell(row_num, 11, f"=CEILING(((D{row_num} * 0.85) - (Config!$B$1 + Config!$B$2)) / 2.5, 0.25)"),
-        ])
-    
-    ws.update_cells(formula_cells, value_input_option="USER_ENTERED")
-    
-    # Format columns
-    try:
-        end_row = row_count + 1
-        ws.format(f"F2:G{end_row}", {"numberFormat": {"type": "PERCENT", "pattern": "##0.00%"}})
-        ws.format(f"H2:K{end_row}", {"numberFormat": {"type": "CURRENCY", "pattern": "$#,##0.00"}})
-    except Exception:
-        pass
 
+    # Headers and data (A-D) in one grid
+    values = [SUMMARY_HEADERS] + [row[:4] for row in summary_rows]
+    end_row = len(values)
+    resize = _grid_resize_request(ws, end_row, len(SUMMARY_HEADERS))
+
+    # Columns E-K: one row-2 formula per column, repeated down to the last row
+    formula_requests = [
+        _formula_column_request(ws, f"{col}2:{col}{end_row}", formula, number_format)
+        for col, formula, number_format in SUMMARY_FORMULAS
+    ] if summary_rows else []
+
+    # Everything goes out in a single spreadsheets.batchUpdate (split only for huge grids)
+    _send_batches(sheet, [resize] if resize else [],
+                  _chunked_write_requests(ws, values, user_entered=True), formula_requests)
+    _forget_resized_worksheet(sheet, ws, resize)
+    _invalidate_reads(sheet, ws)
+
+@lru_cache(maxsize=8192)
 def _strip_color_prefix(description: str, color_name: Optional[str]) -> str:
-    """Remove color name prefix from description if present."""
+    """Remove color name prefix (case-insensitive) from description if present.
+
+    Memoized: the same part description and color recur across many orders.
+    """
     if not color_name or not description:
         return description
-        
-    if description.startswith(color_name):
-        return description[len(color_name):].lstrip()
-    elif description.lower().startswith(color_name.lower()):
-        return description[len(color_name):].lstrip()
+
+    # Compare only the prefix-length slice instead of lowering the whole description
+    prefix_len = len(color_name)
+    if description[:prefix_len].casefold() == color_name.casefold():
+        return description[prefix_len:].lstrip()
     return description
 
-def _aggregate_inventory(items) -> Dict[tuple, Dict[str, Any]]:
-    """Aggregate OrderItems by (item_id, color_key)."""
-    agg = defaultdict(lambda: {
-        'qty': 0, 'total_cost': 0.0, 'unit_cost': 0.0, 'description': '',
-        'color_id': None, 'color_name': None, 'item_type': None,
-    })
-    
-    for item in items or []:
-        key = (item.item_id, None if item.item_type in ('S', 'M') else item.color_id)
-        entry = agg[key]
-        
-        qty = int(getattr(item, 'qty', 0) or 0)
-        cost = float(getattr(item, 'unit_cost', 0.0) or 0.0) * qty
-        new_qty = entry['qty'] + qty
-        new_total = entry['total_cost'] + cost
-
-        # Get description and strip color prefix for parts
-        desc = getattr(item, 'clean_description', None) or getattr(item, 'description', '') or entry['description']
-        color_name = getattr(item, 'color_name', None)
-        
-        if item.item_type == 'P' and color_name and color_name != item.item_type:
-            desc = _strip_color_prefix(desc, color_name)
+def _aggregate_inventory(items) -> Dict[tuple, List[Any]]:
+    """Aggregate OrderItems by (item_id, color_key).
 
-        entry.update({
-            'qty': new_qty,
-            'total_cost': new_total,
-            'unit_cost': new_total / new_qty if new_qty else 0.0,
-            'description': desc,
-            'color_id': item.color_id if item.item_type == 'P' else None,
-            'color_name': color_name,
-            'item_type': item.item_type,
-        })
+    Each entry is a [qty, total_cost, description, color_name, item_type] list;
+    the description is the latest non-empty one and is not yet prefix-stripped.
+    """
+    agg: Dict[tuple, List[Any]] = {}
+    for item in items or []:
+        item_type, color_name = item.item_type, item.color_name
+        key = (item.item_id, None if item_type in ('S', 'M') else item.color_id)
+        qty = item.qty or 0
+        cost = (item.unit_cost or 0.0) * qty
+        desc = item.clean_description or item.description
+        entry = agg.get(key)
+        if entry is None:
+            agg[key] = [qty, cost, desc or '', color_name, item_type]
+        else:
+            entry[0] += qty
+            entry[1] += cost
+            if desc:
+                entry[2] = desc
+            entry[3] = color_name
+            entry[4] = item_type
     return agg
 
 def _update_inventory_worksheet(sheet, tab_name: str, items) -> None:
     """Generic function to update inventory-style worksheets."""
     ws = get_or_create_worksheet(sheet, tab_name)
-    ws.clear()
-    ws.update(values=[INVENTORY_HEADERS], range_name="A1")
-    
-    inventory = _aggregate_inventory(items)
-    rows = [
-        [item_id, data['description'], data['color_name'], data['qty'],
-         round(data['total_cost'], 2), round(data['unit_cost'], 2)]
-        for (item_id, _), data in inventory.items() if data['qty'] > 0
-    ]
-    
-    if rows:
-        ws.update(values=rows, range_name="A2")
+
+    # Strip color prefixes and derive unit cost once per aggregated row
+    rows = []
+    for (item_id, _), (qty, total_cost, desc, color_name, item_type) in _aggregate_inventory(items).items():
+        if qty <= 0:
+            continue
+        if item_type == 'P' and color_name and color_name != item_type:
+            desc = _strip_color_prefix(desc, color_name)
+        rows.append([item_id, desc, color_name, qty, round(total_cost, 2), round(total_cost / qty, 2)])
+
+    # Compare with what the tab already holds and rewrite (RAW) only the span of
+    # rows that changed, clearing any leftover rows below the new end and any
+    # stray cells right of the inventory columns in the rewritten rows (the read
+    # only covers those columns); clearing only userEnteredValue keeps formatting
+    values = [INVENTORY_HEADERS] + rows
+    existing = _read_inventory_values(sheet, ws)
+    span = _changed_span(values, existing)
+    if span is None and len(existing) <= len(values):
+        return
+
+    before = []
+    resize = _grid_resize_request(ws, len(values), len(INVENTORY_HEADERS))
+    if resize:
+        before.append(resize)
+    if len(existing) > len(values):
+        before.append(_clear_values_request(ws, start_row=len(values)))
+    writes, after = [], []
+    if span is not None:
+        first, end = span
+        writes = _chunked_write_requests(ws, values[first:end], start_row=first)
+        after.append(_clear_values_request(ws, start_row=first, end_row=end,
+                                           start_col=len(INVENTORY_HEADERS)))
+    _send_batches(sheet, before, writes, after)
+    _forget_resized_worksheet(sheet, ws, resize)
+    _invalidate_reads(sheet, ws)
 
 def update_inventory_sheet(sheet, items) -> None:
     """Updates the 'Inventory' worksheet."""
@@ -141,44 +453,76 @@ def read_orders_sheet_edits(sheet) -> Dict[tuple, Dict[str, Any]]:
     """Read Orders worksheet to capture user edits."""
     try:
         ws = get_or_create_worksheet(sheet, "Orders")
-        records = ws.get_all_records()
+        # Plain row lists for the written columns; positions follow ORDERS_HEADERS
+        rows = _read_orders_rows(sheet, ws)
+        order_col = ORDERS_COLUMN_INDEX["Order ID"]
+        blank_row = [""] * len(ORDERS_HEADERS)
         edits = {}
         current_order_id = ""
 
-        for record in records:
-            row_order_id = record.get("Order ID", "")
-            item_number = record.get("Item Number", "")
-
-            order_id = row_order_id if row_order_id else current_order_id
+        for row in rows:
+            # Unformatted IDs may be numbers; keys are always matched as text
+            row_order_id = str(row[order_col]) if len(row) > order_col else ""
             if row_order_id:
                 current_order_id = row_order_id
-
+            order_id = current_order_id
             if not order_id:
                 continue
 
-            key = (order_id, item_number)
-            record_copy = record.copy()
-            if not row_order_id and order_id:
-                record_copy["Order ID"] = order_id
-
-            edits[key] = record_copy
+            # Sheets trims trailing empty cells, so pad before pairing with headers
+            record = dict(zip(ORDERS_HEADERS, row + blank_row[len(row):]))
+            record["Order ID"] = order_id
+            record["Item Number"] = str(record["Item Number"])
+            edits[(order_id, record["Item Number"])] = record
 
         return edits
     except Exception:
         return {}
 
-def _format_currency_columns(ws, headers: List[str], columns: List[str], last_row: int) -> None:
-    """Format specified columns as currency."""
-    try:
-        for col in columns:
-            if col in headers:
-                col_idx = headers.index(col)
-                col_letter = chr(ord('A') + col_idx)
-                ws.format(f"{col_letter}2:{col_letter}{last_row}", {
-                    "numberFormat": {"type": "CURRENCY", "pattern": "$#,##0.00"}
-                })
-    except Exception:
-        pass
+def _has_value(value) -> bool:
+    """Return True for non-blank sheet values; only strings need stripping."""
+    if value is None or value == "":
+        return False
+    if isinstance(value, str):
+        return bool(value.strip())
+    return True
+
+def _text(value) -> str:
+    """Render a sheet value as order file text; whole-number floats drop the '.0'."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def _format_like(current: str, number) -> str:
+    """Render number in the style of the file's current text: same $ prefix, commas and decimals."""
+    current = (current or "").strip()
+    text = _text(number)
+    if not current:
+        return text
+    decimals = len(current.rsplit(".", 1)[1]) if "." in current else 0
+    # Never round away digits the new value actually has
+    if "." in text:
+        decimals = max(decimals, len(text.rsplit(".", 1)[1]))
+    digits = f"{abs(number):{',' if ',' in current else ''}.{decimals}f}"
+    prefix = "$" if current.lstrip("-").startswith("$") else ""
+    return f"{'-' if number < 0 else ''}{prefix}{digits}"
+
+def _file_value(field: str, current: Optional[str], value) -> Optional[str]:
+    """Return the text to store for an edited CSV value, or None if current already holds it.
+
+    Numbers compare by value, so "$2.50" on file and 2.5 from the sheet are equal,
+    and changed numbers keep the file's own format.
+    """
+    current = current or ""
+    text = _text(value)
+    is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+    if (is_number or field in _NUMERIC_FIELDS) and _same_number(text, current):
+        return None
+    if text == current:
+        return None
+    return _format_like(current, value) if is_number else text
 
 def update_orders_sheet(sheet, orders) -> None:
     """Updates the 'Orders' worksheet from Order objects."""
@@ -187,71 +531,132 @@ def update_orders_sheet(sheet, orders) -> None:
 
     existing_edits = read_orders_sheet_edits(sheet)
     ws = get_or_create_worksheet(sheet, "Orders")
-    ws.clear()
+
+    # Reduce each edit record once to the (column, value) pairs worth applying
+    compact_edits = {
+        key: [(ORDERS_COLUMN_INDEX[field], val) for field, val in record.items()
+              if field in ORDERS_COLUMN_INDEX and _has_value(val)]
+        for key, record in existing_edits.items()
+    }
 
     data_rows = []
     for order in orders:
+        order_id = order.order_id
         for idx, item in enumerate(order.items):
+            item_id, item_type, color_name = item.item_id, item.item_type, item.color_name
+            qty, price = item.qty, item.price
+
             # Process description
             desc = item.description or ""
-            color_name = getattr(item, 'color_name', None)
-            if item.item_type == 'P' and color_name and color_name != item.item_type:
+            if item_type == 'P' and color_name and color_name != item_type:
                 desc = _strip_color_prefix(desc, color_name)
 
-            # Build item dictionary with order-level fields on first row only
+            # Build the row in ORDERS_HEADERS order, order-level fields on first row only
             is_first_item = idx == 0
-            item_dict = {
-                "Order ID": order.order_id if is_first_item else "",
-                "Seller": order.seller if is_first_item else "",
-                "Order Date": order.order_date if is_first_item else "",
-                "Shipping": order.shipping if is_first_item else "",
-                "Add Chrg 1": order.add_chrg_1 if is_first_item else "",
-                "Order Total": order.order_total if is_first_item else "",
-                "Base Grand Total": order.base_grand_total if is_first_item else "",
-                "Total Lots": order.total_lots if is_first_item else "",
-                "Total Items": order.total_items if is_first_item else "",
-                "Tracking No": order.tracking_no if is_first_item else "",
-                "Condition": item.condition,
-                "Item Number": item.item_id,
-                "Item Description": desc,
-                "Color": getattr(item, 'color_name', item.item_type),
-                "Qty": item.qty,
-                "Each": item.price,
-                "Total": item.qty * item.price
-            }
-
-            # Apply user edits
-            key_item = (order.order_id, item.item_id)
-            key_order = (order.order_id, "")
-            
-            # Apply order-level edits (for first item row only)
-            if is_first_item and key_order in existing_edits:
-                user_record = existing_edits[key_order]
-                for field in ORDERS_HEADERS:
-                    val = user_record.get(field, '')
-                    if str(val).strip():
-                        item_dict[field] = val
-            
-            # Apply item-level edits
-            if key_item in existing_edits:
-                user_record = existing_edits[key_item]
-                for field in ORDERS_HEADERS:
-                    val = user_record.get(field, '')
-                    if str(val).strip():
-                        item_dict[field] = val
-                
-            # Keep order fields blank for non-first rows
-            if not is_first_item:
-                for field in ORDER_LEVEL_FIELDS:
-                    item_dict[field] = ""
-
-            data_rows.append([item_dict.get(col, '') for col in ORDERS_HEADERS])
+            if is_first_item:
+                row = [
+                    order_id, order.seller, order.order_date, order.shipping,
+                    order.add_chrg_1, order.order_total, order.base_grand_total,
+                    order.total_lots, order.total_items, order.tracking_no,
+                ]
+            else:
+                row = [""] * _FIRST_ITEM_COLUMN
+            row += [
+                item.condition,
+                item_id,
+                desc,
+                color_name,
+                qty,
+                price,
+                qty * price,
+            ]
+
+            # Apply order-level edits (first item row only), then item-level edits;
+            # non-first rows keep their order-level columns blank
+            item_edits = compact_edits.get((order_id, item_id), ())
+            if is_first_item:
+                for col, val in compact_edits.get((order_id, ""), ()):
+                    row[col] = val
+                for col, val in item_edits:
+                    row[col] = val
+            else:
+                for col, val in item_edits:
+                    if col >= _FIRST_ITEM_COLUMN:
+                        row[col] = val
+
+            data_rows.append(row)
 
     values = [ORDERS_HEADERS] + data_rows
-    ws.update(values=values, range_name="A1")
-    _format_currency_columns(ws, ORDERS_HEADERS, ["Shipping", "Add Chrg 1", "Order Total", "Base Grand Total", "Each", "Total"], len(values))
+
+    # Clear, write and format in a single spreadsheets.batchUpdate round trip
+    # (split into several only when the grid is too large for one request)
+    before = []
+    resize = _grid_resize_request(ws, len(values), len(ORDERS_HEADERS))
+    if resize:
+        before.append(resize)
+    before.append(_clear_values_request(ws))
+    formats = _currency_format_requests(
+        ws, ORDERS_HEADERS,
+        ["Shipping", "Add Chrg 1", "Order Total", "Base Grand Total", "Each", "Total"],
+        len(values),
+    )
+    _send_batches(sheet, before, _chunked_write_requests(ws, values), formats)
+    _forget_resized_worksheet(sheet, ws, resize)
+    _invalidate_reads(sheet, ws)
 
     
+def _order_files(orders_dir: str) -> Tuple[List[str], List[str]]:
+    """Return the (XML, CSV) order file names to process, from a single directory scan.
+
+    The merged orders.xml / orders.csv take precedence over per-export files.
+    """
+    xml_files, csv_files = [], []
+    with os.scandir(orders_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.xml'):
+                xml_files.append(entry.name)
+            elif entry.name.endswith('.csv'):
+                csv_files.append(entry.name)
+    if 'orders.xml' in xml_files:
+        xml_files = ['orders.xml']
+    if 'orders.csv' in csv_files:
+        csv_files = ['orders.csv']
+    return xml_files, csv_files
+
+
+def _for_each_file(process, orders_dir: str, filenames: List[str]) -> None:
+    """Run process(filepath) for each order file, in parallel when there are several.
+
+    Files are independent, so an unreadable or malformed file is reported and
+    skipped; anything else (a bug) propagates.
+    """
+    def run(filename):
+        filepath = os.path.join(orders_dir, filename)
+        if not os.path.isfile(filepath):
+            return
+        try:
+            process(filepath)
+        except _FILE_ERRORS as e:
+            print(f"Warning: Could not update {filename}: {e}")
+
+    if len(filenames) <= 1:
+        for filename in filenames:
+            run(filename)
+        return
+    with ThreadPoolExecutor(max_workers=min(_MAX_FILE_WORKERS, len(filenames))) as executor:
+        list(executor.map(run, filenames))
+
+# Fields compared by value, so "$2.50" on the sheet matches "2.5" in the file
+_NUMERIC_FIELDS = frozenset(("Qty", "Each", "Order Total", "Base Grand Total"))
+_MONEY_DELETE = str.maketrans("", "", "$,")
+
+def _same_number(a: str, b: str) -> bool:
+    """Return True if both strings parse to the same number (ignoring $ and commas)."""
+    try:
+        return abs(float(a.translate(_MONEY_DELETE)) - float(b.translate(_MONEY_DELETE))) <= 1e-9
+    except ValueError:
+        return False
+
 def detect_changes_before_merge(sheet_edits: Optional[Dict[tuple, Dict[str, Any]]], orders_dir: str) -> Dict[str, List[Dict[str, Any]]]:
     """Detect changes between sheet edits and existing order files before merging."""
     if not sheet_edits:
@@ -262,15 +667,12 @@ def detect_changes_before_merge(sheet_edits: Optional[Dict[tuple, Dict[str, Any]
     
     if os.path.exists(orders_dir):
         # Check for XML files first
-        xml_files = ['orders.xml'] if os.path.exists(os.path.join(orders_dir, 'orders.xml')) else [
-            f for f in os.listdir(orders_dir) if f.endswith('.xml')
-        ]
+        xml_files, _ = _order_files(orders_dir)
         
         for filename in xml_files:
             filepath = os.path.join(orders_dir, filename)
             try:
-                tree = ET.parse(filepath)
-                for order_elem in tree.getroot().findall("ORDER"):
+                for order_elem in iter_orders(filepath):
                     order_id = (order_elem.findtext("ORDERID") or "").strip()
                     if not order_id:
                         continue
@@ -310,20 +712,17 @@ def detect_changes_before_merge(sheet_edits: Optional[Dict[tuple, Dict[str, Any]
         if key in existing_orders:
             # Compare with existing data to detect edits - only check meaningful fields
             existing_data = existing_orders[key]
-            has_changes = False
-            
-            # Define which fields to check for changes
-            fields_to_check = ["Seller", "Order Date", "Order Total", "Base Grand Total"] if not item_number else [
-                "Item Description", "Condition", "Qty", "Each"  # Exclude Color since XML stores IDs, sheets show names
-            ]
-            
-            for field in fields_to_check:
-                sheet_val = str(sheet_data.get(field, "")).strip()
-                existing_val = str(existing_data.get(field, "")).strip()
-                if sheet_val and sheet_val != existing_val:
-                    has_changes = True
-                    break
-            
+            # Existing values are already stripped strings, so equal values skip the
+            # str()/strip() round trip; Color is never compared (XML stores IDs)
+            fields_to_check = _ITEM_EDIT_TAGS if item_number else _ORDER_EDIT_TAGS
+            has_changes = any(
+                sheet_data[field] != existing_data[field]
+                and (sheet_val := str(sheet_data[field]).strip())
+                and sheet_val != existing_data[field]
+                and not (field in _NUMERIC_FIELDS and _same_number(sheet_val, existing_data[field]))
+                for field in fields_to_check if field in sheet_data
+            )
+
             if has_changes:
                 changes['edits'].append({
                     'key': key,
@@ -353,413 +752,534 @@ def detect_changes_before_merge(sheet_edits: Optional[Dict[tuple, Dict[str, Any]
     return changes
 
 
+# Per-thread lxml parsers reused by _parse_xml
+_XML_PARSERS = threading.local()
+
+def _parse_xml(filepath: str):
+    """Parse an order XML file that will be rewritten by _write_xml.
+
+    With lxml the indentation whitespace is dropped while parsing, so the
+    serializer can re-indent in C instead of walking the tree with ET.indent.
+    """
+    if _HAS_LXML:
+        # lxml parsers are reusable but not thread-safe, so keep one per worker thread
+        parser = getattr(_XML_PARSERS, 'parser', None)
+        if parser is None:
+            parser = _XML_PARSERS.parser = ET.XMLParser(remove_blank_text=True)
+        return ET.parse(filepath, parser)
+    return ET.parse(filepath)
+
+def _write_xml(tree, filepath: str) -> None:
+    """Write an order XML tree back to disk in the shared order file format."""
+    root = tree.getroot()
+    write_order_xml(filepath, list(root), root)
+
+# Sheet column -> XML tag for the fields copied back into the order files
+_ORDER_EDIT_TAGS = {
+    "Seller": "SELLER",
+    "Order Date": "ORDERDATE",
+    "Order Total": "ORDERTOTAL",
+    "Base Grand Total": "BASEGRANDTOTAL",
+}
+_ITEM_EDIT_TAGS = {
+    "Condition": "CONDITION",
+    "Qty": "QTY",
+    "Each": "PRICE",
+    "Item Description": "DESCRIPTION",
+}
+
+def _apply_xml_edits(elem, edits: Dict[str, Any], tags: Dict[str, str]) -> None:
+    """Copy edited fields onto the matching child elements of an ORDER/ITEM element."""
+    for field, tag in tags.items():
+        value = edits.get(field)
+        if _has_value(value):
+            child = elem.find(tag)
+            # Merged (minimal) XML omits most tags; create them on demand
+            if child is None:
+                child = ET.SubElement(elem, tag)
+            new_text = _file_value(field, child.text, value)
+            if new_text is not None:
+                child.text = new_text
+
+def _apply_order_edits(order_elem, edits: Dict[str, Any]) -> None:
+    """Copy edited order-level fields onto an ORDER element."""
+    _apply_xml_edits(order_elem, edits, _ORDER_EDIT_TAGS)
+
+
+def _apply_item_edits(item_elem, edits: Dict[str, Any]) -> None:
+    """Copy edited item-level fields onto an ITEM element."""
+    _apply_xml_edits(item_elem, edits, _ITEM_EDIT_TAGS)
+
+
+def _index_items(order_elems) -> Dict[str, List[Any]]:
+    """Map ITEMID -> ITEM elements across the given ORDER elements."""
+    items_by_id = {}
+    for order_elem in order_elems:
+        for item_elem in order_elem.findall("ITEM"):
+            item_id = (item_elem.findtext("ITEMID") or "").strip()
+            if item_id:
+                items_by_id.setdefault(item_id, []).append(item_elem)
+    return items_by_id
+
+
+def _update_xml_files(sheet_edits: Dict[tuple, Dict[str, Any]], orders_dir: str,
+                      xml_files: List[str]) -> None:
+    """Apply sheet edits to the XML order files."""
+    def update_file(filepath):
+        tree = _parse_xml(filepath)
+        root = tree.getroot()
+
+        # Index orders once, then apply each edit by key
+        order_index = {}
+        for order_elem in root.findall("ORDER"):
+            order_id = (order_elem.findtext("ORDERID") or "").strip()
+            if order_id:
+                order_index.setdefault(order_id, []).append(order_elem)
+
+        item_index = {}
+        for (order_id, item_id), edits in sheet_edits.items():
+            order_elems = order_index.get(order_id)
+            if not order_elems:
+                continue
+
+            if not item_id:
+                for order_elem in order_elems:
+                    _apply_order_edits(order_elem, edits)
+                continue
+
+            # Items are indexed lazily, only for orders that have item edits
+            items_by_id = item_index.get(order_id)
+            if items_by_id is None:
+                items_by_id = item_index[order_id] = _index_items(order_elems)
+            for item_elem in items_by_id.get(item_id, []):
+                _apply_item_edits(item_elem, edits)
+
+        # Write back to file
+        _write_xml(tree, filepath)
+
+    _for_each_file(update_file, orders_dir, xml_files)
+
+
+def _rewrite_csv(filepath: str, transform, extra_rows=None) -> bool:
+    """Stream a CSV file through transform(row) into a temp file, then swap it in.
+
+    transform returns the row itself to keep it unchanged, a new dict to
+    replace it, or None to drop it; extra_rows(fieldnames), if given, returns
+    rows to append at the end. Only one row is held in memory and os.replace
+    makes the rewrite atomic. Files with no changes are left untouched.
+    Returns True if the file was rewritten.
+    """
+    tmp_path = filepath + '.tmp'
+    changed = False
+    try:
+        with open(filepath, 'r', newline='', encoding='utf-8', buffering=_CSV_BUFFER_BYTES) as fin, \
+             open(tmp_path, 'w', newline='', encoding='utf-8', buffering=_CSV_BUFFER_BYTES) as fout:
+            reader = csv.DictReader(fin)
+            fieldnames = reader.fieldnames
+            if not fieldnames:
+                # Empty or header-less file: skipped, as there is nothing to match against
+                return False
+            # Plain csv.writer with the header order fixed once; skips DictWriter's per-row checks
+            writer = csv.writer(fout)
+            writer.writerow(fieldnames)
+            for row in reader:
+                new_row = transform(row)
+                if new_row is not row:
+                    changed = True
+                if new_row is not None:
+                    writer.writerow([new_row.get(field, "") for field in fieldnames])
+            if extra_rows is not None:
+                appended = extra_rows(fieldnames)
+                if appended:
+                    changed = True
+                    writer.writerows([row.get(field, "") for field in fieldnames] for row in appended)
+        if changed:
+            os.replace(tmp_path, filepath)
+        return changed
+    finally:
+        # Only still present when the file was skipped, unchanged or failed
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _update_csv_files(sheet_edits: Dict[tuple, Dict[str, Any]], orders_dir: str,
+                      csv_files: List[str]) -> None:
+    """Apply sheet edits to the CSV order files."""
+    def apply_edits(row):
+        key = ((row.get("Order ID") or "").strip(), (row.get("Item Number") or "").strip())
+        edits = sheet_edits.get(key)
+        if not edits:
+            return row
+        # Only columns present in both the file and the edit record
+        updates = {}
+        for field in row.keys() & edits.keys():
+            if _has_value(edits[field]):
+                new_value = _file_value(field, row[field], edits[field])
+                if new_value is not None:
+                    updates[field] = new_value
+        return {**row, **updates} if updates else row
+
+    _for_each_file(lambda filepath: _rewrite_csv(filepath, apply_edits), orders_dir, csv_files)
+
+
 def save_edits_to_files(sheet_edits: Dict[tuple, Dict[str, Any]], orders_dir: str) -> None:
     """Save edited data back to order files."""
     if not sheet_edits or not os.path.exists(orders_dir):
         return
-    
-    # Update XML files
-    xml_files = ['orders.xml'] if os.path.exists(os.path.join(orders_dir, 'orders.xml')) else [
-        f for f in os.listdir(orders_dir) if f.endswith('.xml')
-    ]
-    
-    for filename in xml_files:
-        filepath = os.path.join(orders_dir, filename)
-        try:
-            tree = ET.parse(filepath)
-            root = tree.getroot()
-            
-            for order_elem in root.findall("ORDER"):
-                order_id = (order_elem.findtext("ORDERID") or "").strip()
-                if not order_id:
-                    continue
-                
-                # Update order-level fields
-                order_key = (order_id, "")
-                if order_key in sheet_edits:
-                    edits = sheet_edits[order_key]
-                    if "Seller" in edits and edits["Seller"].strip():
-                        order_elem.find("SELLER").text = edits["Seller"]
-                    if "Order Date" in edits and edits["Order Date"].strip():
-                        order_elem.find("ORDERDATE").text = edits["Order Date"]
-                    if "Order Total" in edits and edits["Order Total"].strip():
-                        order_elem.find("ORDERTOTAL").text = edits["Order Total"]
-                    if "Base Grand Total" in edits and edits["Base Grand Total"].strip():
-                        order_elem.find("BASEGRANDTOTAL").text = edits["Base Grand Total"]
-                
-                # Update item-level fields
-                for item_elem in order_elem.findall("ITEM"):
-                    item_id = (item_elem.findtext("ITEMID") or "").strip()
-                    item_key = (order_id, item_id)
-                    
-                    if item_key in sheet_edits:
-                        edits = sheet_edits[item_key]
-                        if "Condition" in edits and edits["Condition"].strip():
-                            item_elem.find("CONDITION").text = edits["Condition"]
-                        if "Qty" in edits and edits["Qty"].strip():
-                            item_elem.find("QTY").text = edits["Qty"]
-                        if "Each" in edits and edits["Each"].strip():
-                            item_elem.find("PRICE").text = edits["Each"]
-                        if "Item Description" in edits and edits["Item Description"].strip():
-                            item_elem.find("DESCRIPTION").text = edits["Item Description"]
-            
-            # Write back to file
-            ET.indent(tree, space="  ", level=0)
-            tree.write(filepath, encoding='utf-8', xml_declaration=True)
-            
-        except (ET.ParseError, Exception):
-            continue
-    
-    # Update CSV files
-    csv_files = ['orders.csv'] if os.path.exists(os.path.join(orders_dir, 'orders.csv')) else [
-        f for f in os.listdir(orders_dir) if f.endswith('.csv')
-    ]
-    
-    for filename in csv_files:
-        filepath = os.path.join(orders_dir, filename)
-        try:
-            # Read existing CSV
-            rows = []
-            with open(filepath, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                fieldnames = reader.fieldnames
-                for row in reader:
-                    order_id = (row.get("Order ID") or "").strip()
-                    item_number = (row.get("Item Number") or "").strip()
-                    key = (order_id, item_number)
-                    
-                    # Apply edits if they exist
-                    if key in sheet_edits:
-                        edits = sheet_edits[key]
-                        for field, value in edits.items():
-                            if field in row and str(value).strip():
-                                row[field] = value
-                    
-                    rows.append(row)
-            
-            # Write back to file
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(rows)
-                
-        except Exception:
-            continue
+
+    # XML and CSV files are independent, so write them concurrently
+    xml_files, csv_files = _order_files(orders_dir)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(_update_xml_files, sheet_edits, orders_dir, xml_files),
+            executor.submit(_update_csv_files, sheet_edits, orders_dir, csv_files),
+        ]
+        for future in futures:
+            future.result()
 
 
 def detect_deleted_orders(original_rows: List[Dict[str, Any]], sheet_edits: Dict[tuple, Dict[str, Any]]) -> List[Tuple[str, str]]:
     """Detect orders/items that were deleted from the sheet."""
-    deleted_keys = []
-    
-    for row in original_rows:
-        order_id = (row.get("Order ID") or "").strip()
-        item_number = (row.get("Item Number") or "").strip()
-        key = (order_id, item_number)
-        
-        if key not in sheet_edits:
-            deleted_keys.append(key)
-    
-    return deleted_keys
+    original_keys = {
+        key for key in (
+            ((row.get("Order ID") or "").strip(), (row.get("Item Number") or "").strip())
+            for row in original_rows
+        )
+        if key[0]
+    }
+    # Rows without an Order ID never appear in sheet_edits, so they are not deletions
+    return list(original_keys - sheet_edits.keys())
 
 
 def apply_saved_changes_to_files(changes: Dict[str, List[Dict[str, Any]]], orders_dir: str) -> None:
     """Apply all saved changes (edits, additions, deletions) to order files after merging."""
-    if not changes or not os.path.exists(orders_dir):
+    # An empty change set would only re-parse and rewrite the merged files
+    if not changes or not any(changes.values()) or not os.path.exists(orders_dir):
         return
     
+    xml_files, csv_files = _order_files(orders_dir)
+
     # Apply changes to XML files
-    xml_files = ['orders.xml'] if os.path.exists(os.path.join(orders_dir, 'orders.xml')) else [
-        f for f in os.listdir(orders_dir) if f.endswith('.xml')
-    ]
-    
-    for filename in xml_files:
-        filepath = os.path.join(orders_dir, filename)
-        try:
-            tree = ET.parse(filepath)
-            root = tree.getroot()
-            
-            # Apply deletions first
-            deleted_keys = [change['key'] for change in changes.get('deletions', [])]
-            orders_to_remove = []
-            for order_elem in root.findall("ORDER"):
-                order_id = (order_elem.findtext("ORDERID") or "").strip()
-                
-                # Check if entire order should be deleted
-                if (order_id, "") in deleted_keys:
-                    orders_to_remove.append(order_elem)
-                    continue
-                
-                # Remove specific items
-                items_to_remove = []
-                for item_elem in order_elem.findall("ITEM"):
-                    item_id = (item_elem.findtext("ITEMID") or "").strip()
-                    if (order_id, item_id) in deleted_keys:
-                        items_to_remove.append(item_elem)
-                
-                for item_elem in items_to_remove:
-                    order_elem.remove(item_elem)
-            
-            # Remove entire orders
-            for order_elem in orders_to_remove:
-                root.remove(order_elem)
-            
-            # Apply edits to existing orders/items
-            for edit in changes.get('edits', []):
-                key = edit['key']
-                order_id, item_number = key
-                edit_data = edit['changes']
-                
-                # Find the order element
-                order_elem = None
-                for elem in root.findall("ORDER"):
-                    if (elem.findtext("ORDERID") or "").strip() == order_id:
-                        order_elem = elem
-                        break
-                
+    def update_xml_file(filepath):
+        tree = _parse_xml(filepath)
+        root = tree.getroot()
+
+        # Apply deletions first
+        deleted_keys = {change['key'] for change in changes.get('deletions', [])}
+        orders_to_remove = []
+        for order_elem in root.findall("ORDER"):
+            order_id = (order_elem.findtext("ORDERID") or "").strip()
+
+            # Check if entire order should be deleted
+            if (order_id, "") in deleted_keys:
+                orders_to_remove.append(order_elem)
+                continue
+
+            # Remove specific items
+            items_to_remove = []
+            for item_elem in order_elem.findall("ITEM"):
+                item_id = (item_elem.findtext("ITEMID") or "").strip()
+                if (order_id, item_id) in deleted_keys:
+                    items_to_remove.append(item_elem)
+
+            for item_elem in items_to_remove:
+                order_elem.remove(item_elem)
+
+        # Remove entire orders
+        for order_elem in orders_to_remove:
+            root.remove(order_elem)
+
+        # Index the remaining orders once (first element per ID wins)
+        order_index = {}
+        for order_elem in root.findall("ORDER"):
+            order_id = (order_elem.findtext("ORDERID") or "").strip()
+            order_index.setdefault(order_id, order_elem)
+
+        # Apply edits to existing orders/items
+        item_index = {}
+        for edit in changes.get('edits', []):
+            order_id, item_number = edit['key']
+            order_elem = order_index.get(order_id)
+            if order_elem is None:
+                continue
+
+            if not item_number:
+                _apply_order_edits(order_elem, edit['changes'])
+                continue
+
+            # Items are indexed lazily per order; only the first match is updated
+            items_by_id = item_index.get(order_id)
+            if items_by_id is None:
+                items_by_id = item_index[order_id] = _index_items([order_elem])
+            item_elems = items_by_id.get(item_number)
+            if item_elems:
+                _apply_item_edits(item_elems[0], edit['changes'])
+
+        # Apply additions (new orders/items)
+        for addition in changes.get('additions', []):
+            key = addition['key']
+            order_id, item_number = key
+            add_data = addition['data']
+
+            if not item_number:
+                # New order - create order element
+                order_elem = ET.SubElement(root, "ORDER")
+                ET.SubElement(order_elem, "ORDERID").text = order_id
+                ET.SubElement(order_elem, "SELLER").text = _text(add_data.get("Seller"))
+                ET.SubElement(order_elem, "ORDERDATE").text = _text(add_data.get("Order Date"))
+                ET.SubElement(order_elem, "ORDERTOTAL").text = _text(add_data.get("Order Total"))
+                ET.SubElement(order_elem, "BASEGRANDTOTAL").text = _text(add_data.get("Base Grand Total"))
+                order_index.setdefault(order_id, order_elem)
+            else:
+                # New item - find or create order and add item
+                order_elem = order_index.get(order_id)
                 if order_elem is None:
-                    continue
-                    
-                if not item_number:
-                    # Update order-level fields
-                    if "Seller" in edit_data and edit_data["Seller"].strip():
-                        order_elem.find("SELLER").text = edit_data["Seller"]
-                    if "Order Date" in edit_data and edit_data["Order Date"].strip():
-                        order_elem.find("ORDERDATE").text = edit_data["Order Date"]
-                    if "Order Total" in edit_data and edit_data["Order Total"].strip():
-                        order_elem.find("ORDERTOTAL").text = edit_data["Order Total"]
-                    if "Base Grand Total" in edit_data and edit_data["Base Grand Total"].strip():
-                        order_elem.find("BASEGRANDTOTAL").text = edit_data["Base Grand Total"]
-                else:
-                    # Update item-level fields
-                    for item_elem in order_elem.findall("ITEM"):
-                        item_id = (item_elem.findtext("ITEMID") or "").strip()
-                        if item_id == item_number:
-                            if "Condition" in edit_data and edit_data["Condition"].strip():
-                                item_elem.find("CONDITION").text = edit_data["Condition"]
-                            if "Qty" in edit_data and edit_data["Qty"].strip():
-                                item_elem.find("QTY").text = edit_data["Qty"]
-                            if "Each" in edit_data and edit_data["Each"].strip():
-                                item_elem.find("PRICE").text = edit_data["Each"]
-                            if "Item Description" in edit_data and edit_data["Item Description"].strip():
-                                item_elem.find("DESCRIPTION").text = edit_data["Item Description"]
-                            break
-            
-            # Apply additions (new orders/items)
-            for addition in changes.get('additions', []):
-                key = addition['key']
-                order_id, item_number = key
-                add_data = addition['data']
-                
-                if not item_number:
-                    # New order - create order element
+                    # Create new order for this item
                     order_elem = ET.SubElement(root, "ORDER")
                     ET.SubElement(order_elem, "ORDERID").text = order_id
-                    ET.SubElement(order_elem, "SELLER").text = add_data.get("Seller", "")
-                    ET.SubElement(order_elem, "ORDERDATE").text = add_data.get("Order Date", "")
-                    ET.SubElement(order_elem, "ORDERTOTAL").text = add_data.get("Order Total", "")
-                    ET.SubElement(order_elem, "BASEGRANDTOTAL").text = add_data.get("Base Grand Total", "")
-                else:
-                    # New item - find or create order and add item
-                    order_elem = None
-                    for elem in root.findall("ORDER"):
-                        if (elem.findtext("ORDERID") or "").strip() == order_id:
-                            order_elem = elem
-                            break
-                    
-                    if order_elem is None:
-                        # Create new order for this item
-                        order_elem = ET.SubElement(root, "ORDER")
-                        ET.SubElement(order_elem, "ORDERID").text = order_id
-                        ET.SubElement(order_elem, "SELLER").text = add_data.get("Seller", "")
-                        ET.SubElement(order_elem, "ORDERDATE").text = add_data.get("Order Date", "")
-                        ET.SubElement(order_elem, "ORDERTOTAL").text = add_data.get("Order Total", "")
-                        ET.SubElement(order_elem, "BASEGRANDTOTAL").text = add_data.get("Base Grand Total", "")
-                    
-                    # Add the item
-                    item_elem = ET.SubElement(order_elem, "ITEM")
-                    ET.SubElement(item_elem, "ITEMID").text = item_number
-                    ET.SubElement(item_elem, "DESCRIPTION").text = add_data.get("Item Description", "")
-                    ET.SubElement(item_elem, "CONDITION").text = add_data.get("Condition", "")
-                    ET.SubElement(item_elem, "QTY").text = add_data.get("Qty", "")
-                    ET.SubElement(item_elem, "PRICE").text = add_data.get("Each", "")
-                    ET.SubElement(item_elem, "COLOR").text = add_data.get("Color", "")
-            
-            # Write back to file
-            ET.indent(tree, space="  ", level=0)
-            tree.write(filepath, encoding='utf-8', xml_declaration=True)
-            
-        except (ET.ParseError, Exception):
-            continue
+                    ET.SubElement(order_elem, "SELLER").text = _text(add_data.get("Seller"))
+                    ET.SubElement(order_elem, "ORDERDATE").text = _text(add_data.get("Order Date"))
+                    ET.SubElement(order_elem, "ORDERTOTAL").text = _text(add_data.get("Order Total"))
+                    ET.SubElement(order_elem, "BASEGRANDTOTAL").text = _text(add_data.get("Base Grand Total"))
+                    order_index[order_id] = order_elem
+
+                # Add the item
+                item_elem = ET.SubElement(order_elem, "ITEM")
+                ET.SubElement(item_elem, "ITEMID").text = item_number
+                ET.SubElement(item_elem, "DESCRIPTION").text = _text(add_data.get("Item Description"))
+                ET.SubElement(item_elem, "CONDITION").text = _text(add_data.get("Condition"))
+                ET.SubElement(item_elem, "QTY").text = _text(add_data.get("Qty"))
+                ET.SubElement(item_elem, "PRICE").text = _text(add_data.get("Each"))
+                ET.SubElement(item_elem, "COLOR").text = _text(add_data.get("Color"))
+
+        # Write back to file
+        _write_xml(tree, filepath)
+
+    _for_each_file(update_xml_file, orders_dir, xml_files)
     
     # Apply changes to CSV files
-    csv_files = ['orders.csv'] if os.path.exists(os.path.join(orders_dir, 'orders.csv')) else [
-        f for f in os.listdir(orders_dir) if f.endswith('.csv')
-    ]
-    
-    for filename in csv_files:
-        filepath = os.path.join(orders_dir, filename)
-        try:
-            # Read existing CSV
-            rows = []
-            fieldnames = None
-            with open(filepath, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                fieldnames = reader.fieldnames
-                for row in reader:
-                    rows.append(row)
-            
-            if not fieldnames:
-                continue
-                
+    deleted_keys = [change['key'] for change in changes.get('deletions', [])]
+    deleted_order_ids = {key[0] for key in deleted_keys if not key[1]}  # Orders to delete entirely
+    deleted_item_keys = {key for key in deleted_keys if key[1]}  # Specific items to delete
+    additions = [addition['data'] for addition in changes.get('additions', [])]
+
+    def update_csv_file(filepath):
+        # Each edit applies to the first surviving row that matches its key
+        pending_edits = {}
+        for edit in changes.get('edits', []):
+            pending_edits.setdefault(edit['key'], []).append(edit['changes'])
+        current_order_id = ""
+
+        def apply_changes(row):
+            nonlocal current_order_id
+            order_id = row.get("Order ID", "").strip()
+            item_number = row.get("Item Number", "").strip()
+
             # Apply deletions - handle CSV format properly
-            deleted_keys = [change['key'] for change in changes.get('deletions', [])]
-            deleted_order_ids = {key[0] for key in deleted_keys if not key[1]}  # Orders to delete entirely
-            deleted_item_keys = {key for key in deleted_keys if key[1]}  # Specific items to delete
-            
-            filtered_rows = []
-            current_order_id = ""
-            
-            for row in rows:
-                order_id = row.get("Order ID", "").strip()
-                item_number = row.get("Item Number", "").strip()
-                
-                if order_id:
-                    # Header row - update current context
-                    current_order_id = order_id
-                    # Skip if this order should be deleted entirely
-                    if order_id in deleted_order_ids:
-                        continue
+            if order_id:
+                # Header row - update current context
+                current_order_id = order_id
+                # Skip if this order should be deleted entirely
+                if order_id in deleted_order_ids:
+                    return None
+            else:
+                # Item row - check if current order is deleted or this specific item is deleted
+                if current_order_id in deleted_order_ids:
+                    return None
+                if (current_order_id, item_number) in deleted_item_keys:
+                    return None
+
+            # Apply edits, matching by key and considering CSV format
+            keys = [(current_order_id, item_number)] if item_number else []
+            if order_id:
+                keys.insert(0, (order_id, ""))
+            new_row = row
+            for key in keys:
+                for edit_data in pending_edits.pop(key, ()):
+                    for field, value in edit_data.items():
+                        if field not in new_row or not _has_value(value):
+                            continue
+                        new_value = _file_value(field, new_row[field], value)
+                        if new_value is not None:
+                            if new_row is row:
+                                new_row = dict(row)
+                            new_row[field] = new_value
+            return new_row
+
+        def new_rows(fieldnames):
+            # Apply additions: new rows with all fields from fieldnames
+            return [{field: _text(add_data.get(field)) for field in fieldnames} for add_data in additions]
+
+        _rewrite_csv(filepath, apply_changes, new_rows)
+
+    _for_each_file(update_csv_file, orders_dir, csv_files)
+
+
+def _remove_from_xml_file(filepath: str, deleted) -> bool:
+    """Stream an XML order file into a temp file without the deleted orders/items.
+
+    Each child of the root is written out as soon as it has been parsed and is
+    then discarded, so only one ORDER is held in memory. Files with nothing to
+    remove are left untouched. Returns True if the file was rewritten.
+    """
+    if not deleted:
+        return False
+    # Only orders with a deletion target need their items looked at
+    target_orders = {order_id for order_id, _ in deleted}
+    tmp_path = filepath + '.tmp'
+    changed = False
+    try:
+        with open(tmp_path, 'wb') as fout:
+            fout.write(XML_DECLARATION)
+            root = None
+            end_tag = b""
+            trailing = []
+            depth = 0
+            for event, elem in iterparse(filepath):
+                if event == "comment":
+                    # Comments inside an ORDER are written with it; keep the
+                    # ones around the root and between its children here
+                    if root is None:
+                        fout.write(serialize_top_level(elem))
+                    elif depth == 1:
+                        fout.write(serialize_child(elem))
+                    elif depth == 0:
+                        trailing.append(serialize_top_level(elem))
+                    continue
+                if event == "start":
+                    if root is None:
+                        root = elem
+                        start_tag, end_tag = root_tags(root)
+                        fout.write(start_tag)
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth != 1:
+                    continue
+
+                # elem is now a complete child of the root
+                keep = True
+                if elem.tag == "ORDER":
+                    order_id = (elem.findtext("ORDERID") or "").strip()
+                    if order_id in target_orders:
+                        if (order_id, "") in deleted:
+                            keep = False
+                        else:
+                            for item_elem in elem.findall("ITEM"):
+                                if (order_id, (item_elem.findtext("ITEMID") or "").strip()) in deleted:
+                                    elem.remove(item_elem)
+                                    changed = True
+                if keep:
+                    fout.write(serialize_child(elem))
                 else:
-                    # Item row - check if current order is deleted or this specific item is deleted
-                    if current_order_id in deleted_order_ids:
-                        continue
-                    if (current_order_id, item_number) in deleted_item_keys:
-                        continue
-                
-                filtered_rows.append(row)
-            
-            # Apply edits
-            for edit in changes.get('edits', []):
-                key = edit['key']
-                order_id, item_number = key
-                edit_data = edit['changes']
-                
-                current_order_context = ""
-                for row in filtered_rows:
-                    row_order_id = row.get("Order ID", "").strip()
-                    row_item_number = row.get("Item Number", "").strip()
-                    
-                    if row_order_id:
-                        current_order_context = row_order_id
-                    
-                    # Match by key, considering CSV format
-                    if not item_number and row_order_id == order_id:
-                        # Order header edit
-                        for field, value in edit_data.items():
-                            if field in row and str(value).strip():
-                                row[field] = value
-                        break
-                    elif item_number and current_order_context == order_id and row_item_number == item_number:
-                        # Item edit
-                        for field, value in edit_data.items():
-                            if field in row and str(value).strip():
-                                row[field] = value
-                        break
-            
-            # Apply additions
-            for addition in changes.get('additions', []):
-                key = addition['key']
-                add_data = addition['data']
-                
-                # Create new row with all fields from fieldnames
-                new_row = {field: add_data.get(field, "") for field in fieldnames}
-                filtered_rows.append(new_row)
-            
-            # Write back to file
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(filtered_rows)
-                
-        except Exception:
-            continue
+                    changed = True
+                root.clear()
+            fout.write(end_tag)
+            fout.writelines(trailing)
+        if changed:
+            os.replace(tmp_path, filepath)
+        else:
+            os.remove(tmp_path)
+        return changed
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _remove_from_xml_files(deleted_keys: List[Tuple[str, str]], orders_dir: str,
+                           xml_files: List[str]) -> None:
+    """Remove deleted orders/items from the XML order files."""
+    deleted = set(deleted_keys)
+    _for_each_file(lambda filepath: _remove_from_xml_file(filepath, deleted), orders_dir, xml_files)
+
+
+def _filter_csv(filepath: str, make_filter) -> bool:
+    """Stream a CSV file into a temp file, dropping the rows a positional filter rejects.
+
+    make_filter(header) returns keep(row) for plain row lists, so column
+    positions are looked up once per file instead of building a dict per row.
+    The temp file is only created at the first dropped row, so files where
+    every row is kept are just read. Returns True if the file was rewritten.
+    """
+    tmp_path = filepath + '.tmp'
+    fout = None
+    try:
+        with open(filepath, 'r', newline='', encoding='utf-8', buffering=_CSV_BUFFER_BYTES) as fin:
+            reader = csv.reader(fin)
+            header = next(reader, None)
+            if header is None:
+                return False
+            keep = make_filter(header)
+            writer = None
+            kept_before = 0
+            for row in reader:
+                if keep(row):
+                    if writer is None:
+                        kept_before += 1
+                    else:
+                        writer.writerow(row)
+                elif writer is None:
+                    # First dropped row: copy the header and the rows kept so far
+                    fout = open(tmp_path, 'w', newline='', encoding='utf-8', buffering=_CSV_BUFFER_BYTES)
+                    writer = csv.writer(fout)
+                    with open(filepath, 'r', newline='', encoding='utf-8', buffering=_CSV_BUFFER_BYTES) as prefix:
+                        writer.writerows(itertools.islice(csv.reader(prefix), kept_before + 1))
+        if fout is None:
+            return False
+        fout.close()
+        os.replace(tmp_path, filepath)
+        return True
+    except Exception:
+        if fout is not None:
+            fout.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _remove_from_csv_files(deleted_keys: List[Tuple[str, str]], orders_dir: str,
+                           csv_files: List[str]) -> None:
+    """Remove deleted orders/items from the CSV order files."""
+    # Whole orders to drop, and the item numbers to drop per remaining order
+    delete_orders = frozenset(order_id for order_id, item_number in deleted_keys if not item_number)
+    delete_items: Dict[str, set] = {}
+    for order_id, item_number in deleted_keys:
+        if item_number:
+            delete_items.setdefault(order_id, set()).add(item_number)
+
+    def make_filter(header):
+        order_col, item_col = header.index("Order ID"), header.index("Item Number")
+        # Item rows of a BrickLink export leave Order ID blank and belong to the
+        # order above them; the lookups are redone only when a new order starts
+        drop_order, items = False, None
+
+        def keep(row):
+            nonlocal drop_order, items
+            # Short rows read as blank in the missing columns, as with DictReader
+            order_id = row[order_col].strip() if order_col < len(row) else ""
+            if order_id:
+                drop_order = order_id in delete_orders
+                items = delete_items.get(order_id)
+            if drop_order:
+                return False
+            if items is None:
+                return True
+            item_number = row[item_col].strip() if item_col < len(row) else ""
+            return item_number not in items
+        return keep
+
+    _for_each_file(lambda filepath: _filter_csv(filepath, make_filter), orders_dir, csv_files)
 
 
 def remove_deleted_orders_from_files(deleted_keys: List[Tuple[str, str]], orders_dir: str) -> None:
     """Remove deleted orders/items from order files."""
     if not deleted_keys or not os.path.exists(orders_dir):
         return
-    
-    # Process XML files
-    xml_files = ['orders.xml'] if os.path.exists(os.path.join(orders_dir, 'orders.xml')) else [
-        f for f in os.listdir(orders_dir) if f.endswith('.xml')
-    ]
-    
-    for filename in xml_files:
-        filepath = os.path.join(orders_dir, filename)
-        try:
-            tree = ET.parse(filepath)
-            root = tree.getroot()
-            
-            # Remove orders and items based on deleted keys
-            orders_to_remove = []
-            for order_elem in root.findall("ORDER"):
-                order_id = (order_elem.findtext("ORDERID") or "").strip()
-                
-                # Check if entire order should be deleted
-                if (order_id, "") in deleted_keys:
-                    orders_to_remove.append(order_elem)
-                    continue
-                
-                # Remove specific items
-                items_to_remove = []
-                for item_elem in order_elem.findall("ITEM"):
-                    item_id = (item_elem.findtext("ITEMID") or "").strip()
-                    if (order_id, item_id) in deleted_keys:
-                        items_to_remove.append(item_elem)
-                
-                for item_elem in items_to_remove:
-                    order_elem.remove(item_elem)
-            
-            # Remove entire orders
-            for order_elem in orders_to_remove:
-                root.remove(order_elem)
-            
-            # Write back to file
-            ET.indent(tree, space="  ", level=0)
-            tree.write(filepath, encoding='utf-8', xml_declaration=True)
-            
-        except (ET.ParseError, Exception):
-            continue
-    
-    # Process CSV files
-    csv_files = ['orders.csv'] if os.path.exists(os.path.join(orders_dir, 'orders.csv')) else [
-        f for f in os.listdir(orders_dir) if f.endswith('.csv')
-    ]
-    
-    for filename in csv_files:
-        filepath = os.path.join(orders_dir, filename)
-        try:
-            # Read existing CSV
-            remaining_rows = []
-            with open(filepath, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                fieldnames = reader.fieldnames
-                
-                for row in reader:
-                    order_id = (row.get("Order ID") or "").strip()
-                    item_number = (row.get("Item Number") or "").strip()
-                    key = (order_id, item_number)
-                    
-                    # Keep row if it's not in deleted keys
-                    if key not in deleted_keys:
-                        remaining_rows.append(row)
-            
-            # Write back to file
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(remaining_rows)
-                
-        except Exception:
-            continue
\ No newline at end of file
+
+    # XML and CSV files are independent, so rewrite them concurrently
+    xml_files, csv_files = _order_files(orders_dir)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(_remove_from_xml_files, deleted_keys, orders_dir, xml_files),
+            executor.submit(_remove_from_csv_files, deleted_keys, orders_dir, csv_files),
+        ]
+        for future in futures:
+            future.result()
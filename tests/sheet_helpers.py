@@ -0,0 +1,36 @@
+"""
+Shared helpers for tests that mock the Orders worksheet.
+"""
+import os
+import sys
+
+# Allow importing modules from the scripts directory
+CURRENT_DIR = os.path.dirname(__file__)
+SCRIPTS_DIR = os.path.abspath(os.path.join(CURRENT_DIR, '..', 'scripts'))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from sheets import ORDERS_HEADERS  # noqa: E402
+
+
+def sheet_rows(records):
+    """Lay out Orders sheet records as the row lists returned by ws.get()."""
+    return [[record.get(header, "") for header in ORDERS_HEADERS] for record in records]
+
+
+def full_record(record):
+    """Expand a partial Orders record to every header, as read back from the sheet."""
+    return {header: record.get(header, "") for header in ORDERS_HEADERS}
+
+
+def written_values(mock_sheet):
+    """Decode the grid written through sheet.batch_update back into Python values."""
+    body = mock_sheet.batch_update.call_args[0][0]
+    for request in body["requests"]:
+        rows = request.get("updateCells", {}).get("rows")
+        if rows is not None:
+            return [
+                [next(iter(cell["userEnteredValue"].values())) if cell else "" for cell in row["values"]]
+                for row in rows
+            ]
+    return None
@@ -93,6 +93,30 @@ class TestChangeDetection(unittest.TestCase):
         self.assertEqual(len(changes['additions']), 0) 
         self.assertEqual(len(changes['deletions']), 0)
     
+    def test_formatted_numbers_are_not_edits(self):
+        """Test that currency formatting and trailing zeros on the sheet are not treated as edits."""
+        self.create_test_xml()
+
+        sheet_edits = {
+            ("12345", ""): {
+                "Seller": "TestSeller",
+                "Order Total": "$25.00",
+                "Base Grand Total": "$27.50",
+            },
+            ("12345", "3001"): {
+                "Condition": "N",
+                "Qty": "10",
+                "Each": "$2.50",
+            }
+        }
+
+        changes = detect_changes_before_merge(sheet_edits, self.orders_dir)
+        self.assertEqual(changes['edits'], [])
+
+        sheet_edits[("12345", "3001")]["Each"] = "$2.75"
+        changes = detect_changes_before_merge(sheet_edits, self.orders_dir)
+        self.assertEqual([edit['key'] for edit in changes['edits']], [("12345", "3001")])
+
     def test_edits_detected(self):
         """Test that edits are properly detected."""
         # Create test order file
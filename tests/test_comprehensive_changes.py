@@ -244,6 +244,100 @@ class TestComprehensiveChanges(unittest.TestCase):
         self.assertEqual(item.findtext('DESCRIPTION'), 'New Item')
         self.assertEqual(item.findtext('CONDITION'), 'U')
     
+    def test_empty_changes_leave_files_untouched(self):
+        """Test that an empty change set does not rewrite the merged files."""
+        self.create_test_xml()
+        self.create_test_csv()
+        paths = [os.path.join(self.orders_dir, name) for name in ("orders.xml", "orders.csv")]
+        before = [os.stat(path).st_mtime_ns for path in paths]
+
+        apply_saved_changes_to_files({'edits': [], 'additions': [], 'deletions': []}, self.orders_dir)
+
+        self.assertEqual([os.stat(path).st_mtime_ns for path in paths], before)
+
+    def test_edits_apply_to_merged_xml(self):
+        """Test that edits apply to minimal merge_xml output lacking SELLER/ITEMID tags."""
+        import merge_orders
+        self.create_test_xml("export.xml")
+        original_orders_dir = merge_orders.ORDERS_DIR
+        merge_orders.ORDERS_DIR = self.orders_dir
+        try:
+            merge_orders.merge_xml()
+        finally:
+            merge_orders.ORDERS_DIR = original_orders_dir
+
+        changes = {
+            'edits': [
+                {'key': ('12345', ''), 'changes': {'Seller': 'EditedSeller'}},
+                {'key': ('12345', '3001'), 'changes': {'Qty': '15'}},
+            ],
+            'additions': [],
+            'deletions': []
+        }
+        apply_saved_changes_to_files(changes, self.orders_dir)
+
+        root = ET.parse(os.path.join(self.orders_dir, 'orders.xml')).getroot()
+        order_12345 = [o for o in root.findall('ORDER') if o.findtext('ORDERID') == '12345'][0]
+        self.assertEqual(order_12345.findtext('SELLER'), 'EditedSeller')
+
+    def test_numeric_addition_values_are_written_as_text(self):
+        """Test that unformatted (numeric) sheet values in additions are written as text."""
+        self.create_test_xml()
+        self.create_test_csv()
+        changes = {
+            'edits': [],
+            'additions': [{
+                'key': ('12347', '3003'),
+                'data': {'Order ID': '12347', 'Item Number': '3003', 'Order Total': 20.5,
+                         'Qty': 4.0, 'Each': 2.5, 'Color': 11}
+            }],
+            'deletions': []
+        }
+
+        apply_saved_changes_to_files(changes, self.orders_dir)
+
+        root = ET.parse(os.path.join(self.orders_dir, 'orders.xml')).getroot()
+        order = [o for o in root.findall('ORDER') if o.findtext('ORDERID') == '12347'][0]
+        self.assertEqual(order.findtext('ORDERTOTAL'), '20.5')
+        item = order.find('ITEM')
+        self.assertEqual(item.findtext('QTY'), '4')
+        self.assertEqual(item.findtext('PRICE'), '2.5')
+        self.assertEqual(item.findtext('COLOR'), '11')
+
+        with open(os.path.join(self.orders_dir, 'orders.csv'), newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual((rows[-1]['Qty'], rows[-1]['Each']), ('4', '2.5'))
+
+    def test_numerically_equal_edits_leave_csv_untouched(self):
+        """Test that unformatted numbers equal to the CSV's values do not rewrite the file."""
+        self.create_test_csv()
+        csv_file = os.path.join(self.orders_dir, 'orders.csv')
+        before = os.stat(csv_file).st_mtime_ns
+        changes = {
+            'edits': [{'key': ('12345', '3001'), 'changes': {'Qty': 10, 'Each': 2.5}}],
+            'additions': [],
+            'deletions': []
+        }
+
+        apply_saved_changes_to_files(changes, self.orders_dir)
+
+        self.assertEqual(os.stat(csv_file).st_mtime_ns, before)
+
+    def test_headerless_csv_is_skipped(self):
+        """Test that an empty CSV file is left alone when additions are applied."""
+        csv_file = os.path.join(self.orders_dir, 'orders.csv')
+        open(csv_file, 'w').close()
+        changes = {
+            'edits': [],
+            'additions': [{'key': ('12347', ''), 'data': {'Order ID': '12347', 'Seller': 'NewSeller'}}],
+            'deletions': []
+        }
+
+        apply_saved_changes_to_files(changes, self.orders_dir)
+
+        self.assertEqual(os.path.getsize(csv_file), 0)
+        self.assertEqual(os.listdir(self.orders_dir), ['orders.csv'])
+
     def test_apply_comprehensive_changes_csv(self):
         """Test applying edits, additions, and deletions to CSV files."""
         # Create test CSV file
@@ -1,6 +1,9 @@
 import os
+import shutil
 import sys
+import tempfile
 import unittest
+from unittest.mock import Mock
 
 # Allow importing modules from the scripts directory
 CURRENT_DIR = os.path.dirname(__file__)
@@ -9,6 +12,8 @@ if SCRIPTS_DIR not in sys.path:
     sys.path.insert(0, SCRIPTS_DIR)
 
 import colors  # noqa: E402
+import config  # noqa: E402
+import orders  # noqa: E402
 from build_logic import determine_buildable  # noqa: E402
 from orders import OrderItem  # noqa: E402
 from wanted_lists import WantedList, RequiredItem  # noqa: E402
@@ -28,6 +33,62 @@ class TestColors(unittest.TestCase):
         self.assertEqual(colors.get_color_name("abc"), "abc")
 
 
+class TestWorksheetLookup(unittest.TestCase):
+    def test_worksheet_resolved_once_per_spreadsheet(self):
+        sheet = Mock()
+        first = config.get_or_create_worksheet(sheet, "Orders")
+        self.assertIs(config.get_or_create_worksheet(sheet, "Orders"), first)
+        sheet.worksheet.assert_called_once_with("Orders")
+
+    def test_cache_worksheets_uses_one_metadata_request(self):
+        sheet = Mock()
+        summary = Mock()
+        summary.title = "Summary"
+        sheet.worksheets.return_value = [summary]
+        config.cache_worksheets(sheet)
+        self.assertIs(config.get_or_create_worksheet(sheet, "Summary"), summary)
+        sheet.worksheet.assert_not_called()
+
+    def test_forgotten_worksheet_is_resolved_again(self):
+        sheet = Mock()
+        config.get_or_create_worksheet(sheet, "Orders")
+        config.forget_worksheet(sheet, "Orders")
+        config.get_or_create_worksheet(sheet, "Orders")
+        self.assertEqual(sheet.worksheet.call_count, 2)
+
+
+class TestXmlIndexes(unittest.TestCase):
+    def setUp(self):
+        self.orders_dir = tempfile.mkdtemp()
+        self.original_orders_dir = orders.ORDERS_DIR
+        orders.ORDERS_DIR = self.orders_dir
+
+    def tearDown(self):
+        orders.ORDERS_DIR = self.original_orders_dir
+        shutil.rmtree(self.orders_dir)
+
+    def _write(self, filename, content):
+        with open(os.path.join(self.orders_dir, filename), 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def test_only_top_level_orders_are_indexed(self):
+        self._write('export.xml', """<ORDERS>
+  <ORDER><ORDERID>1</ORDERID><ITEM><LOTID>L1</LOTID><COLOR>5</COLOR></ITEM>
+    <NOTES><ORDER><ORDERID>2</ORDERID><ITEM><LOTID>L2</LOTID><COLOR>7</COLOR></ITEM></ORDER></NOTES>
+  </ORDER>
+</ORDERS>""")
+        colors_by_lot, _ = orders._build_xml_indexes()
+        self.assertEqual(colors_by_lot, {("1", "L1"): 5})
+
+    def test_malformed_file_adds_nothing(self):
+        self._write('good.xml', "<ORDERS><ORDER><ORDERID>1</ORDERID>"
+                                "<ITEM><LOTID>L1</LOTID><COLOR>5</COLOR></ITEM></ORDER></ORDERS>")
+        self._write('broken.xml', "<ORDERS><ORDER><ORDERID>2</ORDERID>"
+                                  "<ITEM><LOTID>L2</LOTID><COLOR>7</COLOR></ITEM></ORDER><ORDER>")
+        colors_by_lot, _ = orders._build_xml_indexes()
+        self.assertEqual(colors_by_lot, {("1", "L1"): 5})
+
+
 class TestBuildLogic(unittest.TestCase):
     def test_set_only_builds(self):
         inv = [
@@ -21,6 +21,8 @@ from sheets import (
     update_orders_sheet
 )
 from orders import Order, OrderItem
+from order_xml import XML_DECLARATION
+from sheet_helpers import sheet_rows, full_record, written_values
 
 
 class TestFullSheetEditing(unittest.TestCase):
@@ -87,7 +89,7 @@ class TestFullSheetEditing(unittest.TestCase):
         mock_ws = Mock()
         
         # Mock sheet data with various edited fields
-        mock_ws.get_all_records.return_value = [
+        mock_ws.get.return_value = sheet_rows([
             {
                 "Order ID": "12345",
                 "Seller": "EditedSeller",  # User edit
@@ -126,7 +128,7 @@ class TestFullSheetEditing(unittest.TestCase):
                 "Each": "3.00",  # User edit
                 "Total": "36.00"  # User edit
             }
-        ]
+        ])
         
         with patch('sheets.get_or_create_worksheet', return_value=mock_ws):
             edits = read_orders_sheet_edits(mock_sheet)
@@ -248,6 +250,49 @@ class TestFullSheetEditing(unittest.TestCase):
             self.assertEqual(row['Total'], '36.00')
             self.assertEqual(row['Item Description'], 'Edited Brick Description')
 
+    def test_save_numeric_edits_keep_csv_format(self):
+        """Test that unformatted sheet numbers compare by value and keep the CSV's formatting."""
+        csv_file = os.path.join(self.test_dir, 'orders.csv')
+        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+            f.write("Order ID,Item Number,Qty,Each,Total\n12345,3001,12,$2.50,\"$1,030.00\"\n")
+        before = os.stat(csv_file)
+
+        # Same values as on file, as read back with UNFORMATTED_VALUE
+        save_edits_to_files({("12345", "3001"): {"Qty": 12, "Each": 2.5, "Total": 1030}}, self.orders_dir)
+        self.assertEqual(os.stat(csv_file).st_mtime_ns, before.st_mtime_ns)
+
+        save_edits_to_files({("12345", "3001"): {"Qty": 13.0, "Each": 3, "Total": 1234.5}}, self.orders_dir)
+        with open(csv_file, newline='', encoding='utf-8') as f:
+            row = next(csv.DictReader(f))
+        self.assertEqual((row['Qty'], row['Each'], row['Total']), ('13', '$3.00', '$1,234.50'))
+
+    def test_save_edits_leaves_untouched_csv_files_alone(self):
+        """Test that CSV files without matching edits are not rewritten."""
+        self.create_test_csv('orders.csv')
+        csv_file = os.path.join(self.test_dir, 'orders.csv')
+        before = os.stat(csv_file)
+
+        save_edits_to_files({("99999", "3001"): {"Qty": "12"}}, self.orders_dir)
+
+        after = os.stat(csv_file)
+        self.assertEqual(after.st_ino, before.st_ino)
+        self.assertEqual(after.st_mtime_ns, before.st_mtime_ns)
+        self.assertEqual(os.listdir(self.test_dir), ['orders.csv'])
+
+    def test_save_edits_to_multiple_export_files(self):
+        """Test that every per-export file is updated, and a broken file does not stop the rest."""
+        for n in range(3):
+            self.create_test_xml(f'export{n}.xml', order_id=f"1000{n}")
+        with open(os.path.join(self.test_dir, 'broken.xml'), 'w', encoding='utf-8') as f:
+            f.write("<ORDERS><ORDER>")
+
+        sheet_edits = {(f"1000{n}", ""): {"Seller": f"Seller{n}"} for n in range(3)}
+        save_edits_to_files(sheet_edits, self.orders_dir)
+
+        for n in range(3):
+            root = ET.parse(os.path.join(self.test_dir, f'export{n}.xml')).getroot()
+            self.assertEqual(root.find("ORDER").findtext("SELLER"), f"Seller{n}")
+
     def test_detect_deleted_orders(self):
         """Test detecting deleted orders/items."""
         # Original order rows
@@ -327,6 +372,54 @@ class TestFullSheetEditing(unittest.TestCase):
         self.assertEqual(len(items), 1)
         self.assertEqual(items[0].findtext("ITEMID"), "3001")
 
+    def test_remove_deleted_orders_leaves_untouched_xml_files_alone(self):
+        """Test that XML files without deleted orders/items are not rewritten."""
+        self.create_test_xml('orders.xml')
+        xml_file = os.path.join(self.test_dir, 'orders.xml')
+        before = os.stat(xml_file)
+
+        remove_deleted_orders_from_files([("99999", "")], self.orders_dir)
+
+        after = os.stat(xml_file)
+        self.assertEqual(after.st_ino, before.st_ino)
+        self.assertEqual(after.st_mtime_ns, before.st_mtime_ns)
+        self.assertEqual(os.listdir(self.test_dir), ['orders.xml'])
+
+    def test_remove_deleted_orders_keeps_root_attributes_and_comments(self):
+        """Test that streaming XML removal keeps root attributes and root-level comments."""
+        xml_file = os.path.join(self.test_dir, 'orders.xml')
+        with open(xml_file, 'w', encoding='utf-8') as f:
+            f.write('''<?xml version="1.0" encoding="UTF-8"?>
+<ORDERS version="2">
+  <!-- exported orders -->
+  <ORDER><ORDERID>12345</ORDERID></ORDER>
+  <ORDER><ORDERID>67890</ORDERID></ORDER>
+</ORDERS>
+''')
+
+        remove_deleted_orders_from_files([("67890", "")], self.orders_dir)
+
+        with open(xml_file, 'rb') as f:
+            content = f.read()
+        self.assertTrue(content.startswith(XML_DECLARATION))
+        self.assertIn(b"<!-- exported orders -->", content)
+        root = ET.fromstring(content)
+        self.assertEqual(root.get("version"), "2")
+        self.assertEqual([o.findtext("ORDERID") for o in root.findall("ORDER")], ["12345"])
+
+    def test_remove_deleted_orders_leaves_untouched_csv_files_alone(self):
+        """Test that CSV files without deleted orders/items are not rewritten."""
+        self.create_test_csv('orders.csv')
+        csv_file = os.path.join(self.test_dir, 'orders.csv')
+        before = os.stat(csv_file)
+
+        remove_deleted_orders_from_files([("99999", ""), ("12345", "9999")], self.orders_dir)
+
+        after = os.stat(csv_file)
+        self.assertEqual(after.st_ino, before.st_ino)
+        self.assertEqual(after.st_mtime_ns, before.st_mtime_ns)
+        self.assertEqual(os.listdir(self.test_dir), ['orders.csv'])
+
     def test_remove_deleted_orders_from_csv_files(self):
         """Test removing deleted orders/items from CSV files."""
         # Create CSV with multiple entries
@@ -370,10 +463,30 @@ class TestFullSheetEditing(unittest.TestCase):
         self.assertEqual(rows[0]['Order ID'], '12345')
         self.assertEqual(rows[0]['Item Number'], '3001')
 
+    def test_remove_deleted_orders_from_bricklink_csv(self):
+        """Test that item rows without an Order ID are matched to the order above them."""
+        csv_file = os.path.join(self.test_dir, 'orders.csv')
+        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Order ID', 'Order Date', 'Item Number', 'Qty'])
+            writer.writerow(['12345', '2024-01-01', '', ''])
+            writer.writerow(['', '', '3001', '10'])
+            writer.writerow(['', '', '3002', '5'])
+            writer.writerow(['67890', '2024-01-02', '', ''])
+            writer.writerow(['', '', '4001', '3'])
+            writer.writerow(['11111', '2024-01-03', '', ''])
+            writer.writerow(['', '', '3002', '1'])
+
+        remove_deleted_orders_from_files([("12345", "3002"), ("67890", "")], self.orders_dir)
+
+        with open(csv_file, 'r', newline='', encoding='utf-8') as f:
+            rows = [(row['Order ID'], row['Item Number']) for row in csv.DictReader(f)]
+        self.assertEqual(rows, [('12345', ''), ('', '3001'), ('11111', ''), ('', '3002')])
+
     def test_update_orders_sheet_preserves_all_edits(self):
         """Test that update_orders_sheet preserves ALL user edits, not just limited fields."""
         mock_sheet = Mock()
-        mock_ws = Mock()
+        mock_ws = Mock(id=0, row_count=100, col_count=20)
         
         # Mock existing edits with various fields
         existing_edits = {
@@ -425,12 +538,11 @@ class TestFullSheetEditing(unittest.TestCase):
             
             update_orders_sheet(mock_sheet, orders)
             
-            # Verify ws.update was called
-            mock_ws.update.assert_called_once()
+            # Verify the sheet was written in a single batch update
+            mock_sheet.batch_update.assert_called_once()
             
             # Get the values that were written to the sheet
-            call_args = mock_ws.update.call_args
-            values = call_args[1]['values'] if 'values' in call_args[1] else call_args[0][0] if call_args[0] else None
+            values = written_values(mock_sheet)
             
             self.assertIsNotNone(values)
             self.assertTrue(len(values) > 1)  # Should have headers plus data
@@ -0,0 +1,131 @@
+import os
+import sys
+import unittest
+from unittest.mock import Mock, patch
+
+import gspread
+
+# Allow importing modules from the scripts directory
+CURRENT_DIR = os.path.dirname(__file__)
+SCRIPTS_DIR = os.path.abspath(os.path.join(CURRENT_DIR, '..', 'scripts'))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from sheets import update_inventory_sheet  # noqa: E402
+from orders import OrderItem  # noqa: E402
+
+
+def _inventory_items():
+    return [
+        OrderItem(item_id='3001', item_type='P', color_id=5, qty=4, price=0.1,
+                  unit_cost=0.25, description='Red Brick 2 x 4', color_name='Red'),
+        OrderItem(item_id='3001', item_type='P', color_id=5, qty=2, price=0.1,
+                  unit_cost=0.40, description='Red Brick 2 x 4', color_name='Red'),
+        OrderItem(item_id='3001', item_type='P', color_id=1, qty=1, price=0.1,
+                  unit_cost=0.30, description='white Brick 2 x 4', color_name='White'),
+        OrderItem(item_id='sw0001', item_type='M', color_id=0, qty=1, price=5.0,
+                  unit_cost=5.5, description='Battle Droid', color_name='M'),
+        OrderItem(item_id='sw0002', item_type='M', color_id=0, qty=0, price=5.0,
+                  unit_cost=5.5, description='Empty Lot', color_name='M'),
+    ]
+
+
+class TestInventorySheet(unittest.TestCase):
+
+    def test_inventory_rows_are_aggregated(self):
+        """Lots are merged by (item, color), prefixes stripped and empty lots skipped."""
+        mock_sheet = Mock()
+        mock_ws = Mock(id=7, row_count=100, col_count=20)
+        mock_ws.get.return_value = []
+
+        with patch('sheets.get_or_create_worksheet', return_value=mock_ws):
+            update_inventory_sheet(mock_sheet, _inventory_items())
+
+        mock_ws.get.assert_called_once_with("A1:F", value_render_option="UNFORMATTED_VALUE")
+        mock_ws.clear.assert_not_called()
+        mock_ws.update.assert_not_called()
+        mock_sheet.batch_update.assert_called_once()
+
+        requests = mock_sheet.batch_update.call_args[0][0]["requests"]
+        self.assertEqual([next(iter(r)) for r in requests], ["updateCells", "updateCells"])
+        self.assertEqual(requests[0]["updateCells"]["start"], {"sheetId": 7, "rowIndex": 0, "columnIndex": 0})
+        # Stale cells right of column F are cleared in the rewritten rows
+        self.assertEqual(requests[1]["updateCells"]["range"],
+                         {"sheetId": 7, "endRowIndex": 4, "startColumnIndex": 6})
+
+        rows = [
+            [next(iter(cell["userEnteredValue"].values())) for cell in row["values"]]
+            for row in requests[0]["updateCells"]["rows"]
+        ]
+        self.assertEqual(rows[0][0], "Item ID")
+        self.assertEqual(rows[1:], [
+            ['3001', 'Brick 2 x 4', 'Red', 6, 1.8, 0.3],
+            ['3001', 'Brick 2 x 4', 'White', 1, 0.3, 0.3],
+            ['sw0001', 'Battle Droid', 'M', 1, 5.5, 5.5],
+        ])
+        # RAW semantics: numeric-looking strings stay text
+        self.assertEqual(requests[0]["updateCells"]["rows"][1]["values"][0],
+                         {"userEnteredValue": {"stringValue": "3001"}})
+
+    def test_only_changed_rows_are_rewritten(self):
+        """Unchanged rows are skipped and rows past the new end are cleared."""
+        mock_sheet = Mock()
+        mock_ws = Mock(id=7, row_count=100, col_count=20)
+        mock_ws.get.return_value = [
+            ["Item ID", "Description", "Color", "Qty", "Total Cost", "Unit Cost"],
+            ["3001", "Brick 2 x 4", "Red", 6, 1.8, 0.3],
+            ["3001", "Brick 2 x 4", "White", 2, 0.6, 0.3],
+            ["sw0001", "Battle Droid", "M", 1, 5.5, 5.5],
+            ["sw0003", "Old Lot", "M", 1, 4, 4],
+        ]
+
+        with patch('sheets.get_or_create_worksheet', return_value=mock_ws):
+            update_inventory_sheet(mock_sheet, _inventory_items())
+
+        requests = mock_sheet.batch_update.call_args[0][0]["requests"]
+        self.assertEqual(requests[0]["updateCells"]["range"], {"sheetId": 7, "startRowIndex": 4})
+        write = requests[1]["updateCells"]
+        self.assertEqual(write["start"]["rowIndex"], 2)
+        self.assertEqual(len(write["rows"]), 1)
+        self.assertEqual(write["rows"][0]["values"][3], {"userEnteredValue": {"numberValue": 1}})
+        self.assertEqual(requests[2]["updateCells"]["range"],
+                         {"sheetId": 7, "startRowIndex": 2, "endRowIndex": 3, "startColumnIndex": 6})
+
+    def test_unchanged_inventory_is_not_written(self):
+        """No batchUpdate is sent when the tab already holds the same rows."""
+        mock_sheet = Mock()
+        mock_ws = Mock(id=7, row_count=100, col_count=20)
+        mock_ws.get.return_value = [
+            ["Item ID", "Description", "Color", "Qty", "Total Cost", "Unit Cost"],
+            ["3001", "Brick 2 x 4", "Red", 6, 1.8, 0.3],
+            ["3001", "Brick 2 x 4", "White", 1, 0.3, 0.3],
+            ["sw0001", "Battle Droid", "M", 1, 5.5, 5.5],
+        ]
+
+        with patch('sheets.get_or_create_worksheet', return_value=mock_ws):
+            update_inventory_sheet(mock_sheet, _inventory_items())
+
+        mock_sheet.batch_update.assert_not_called()
+
+    def test_transient_api_errors_are_retried(self):
+        """Rate-limit responses are retried with backoff; other API errors propagate."""
+        rate_limited = gspread.exceptions.APIError(Mock(status_code=429))
+        mock_sheet = Mock()
+        mock_sheet.batch_update.side_effect = [rate_limited, {}]
+        mock_ws = Mock(id=7, row_count=100, col_count=20)
+        mock_ws.get.return_value = []
+
+        with patch('sheets.get_or_create_worksheet', return_value=mock_ws), \
+             patch('sheets.time.sleep') as mock_sleep:
+            update_inventory_sheet(mock_sheet, _inventory_items())
+            self.assertEqual(mock_sheet.batch_update.call_count, 2)
+            mock_sleep.assert_called_once()
+
+            mock_sheet.batch_update.side_effect = gspread.exceptions.APIError(Mock(status_code=400))
+            with self.assertRaises(gspread.exceptions.APIError):
+                update_inventory_sheet(mock_sheet, _inventory_items())
+            mock_sleep.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
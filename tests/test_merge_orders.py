@@ -144,6 +144,21 @@ class TestMergeOrders(unittest.TestCase):
         self.assertEqual(invalid_date, merge_orders.datetime.min)
 
 
+    def test_merged_xml_survives_rewrite_unchanged(self):
+        """Test that sheets.py rewriting merged orders.xml reproduces it byte for byte."""
+        import sheets
+        self.create_test_xml('older.xml', '12345', '2024-08-15T10:30:00.000Z')
+        self.create_test_xml('newer.xml', '12346', '2024-08-20T15:45:00.000Z')
+        merge_orders.merge_xml()
+        merged_path = os.path.join(self.test_dir, 'orders.xml')
+        with open(merged_path, 'rb') as f:
+            merged = f.read()
+
+        sheets._write_xml(sheets._parse_xml(merged_path), merged_path)
+
+        with open(merged_path, 'rb') as f:
+            self.assertEqual(f.read(), merged)
+
     def test_no_duplication_when_merged_files_exist(self):
         """Test that individual files are not processed when merged files exist."""
         # Create individual order files
@@ -3,14 +3,21 @@ import sys
 import unittest
 from unittest.mock import Mock, patch
 
+import gspread
+from gspread.exceptions import WorksheetNotFound
+
 # Allow importing modules from the scripts directory
 CURRENT_DIR = os.path.dirname(__file__)
 SCRIPTS_DIR = os.path.abspath(os.path.join(CURRENT_DIR, '..', 'scripts'))
 if SCRIPTS_DIR not in sys.path:
     sys.path.insert(0, SCRIPTS_DIR)
 
-from sheets import read_orders_sheet_edits, update_orders_sheet  # noqa: E402
+from sheets import (  # noqa: E402
+    ORDERS_HEADERS, prefetch_sheet_reads, read_orders_sheet_edits, update_orders_sheet,
+)
 from orders import Order, OrderItem  # noqa: E402
+import config  # noqa: E402
+from sheet_helpers import sheet_rows, full_record, written_values  # noqa: E402
 
 
 class TestSheetsEditing(unittest.TestCase):
@@ -19,7 +26,7 @@ class TestSheetsEditing(unittest.TestCase):
         """Test reading edits from an empty sheet returns empty dict."""
         mock_sheet = Mock()
         mock_ws = Mock()
-        mock_ws.get_all_records.return_value = []
+        mock_ws.get.return_value = sheet_rows([])
         
         with patch('sheets.get_or_create_worksheet', return_value=mock_ws):
             edits = read_orders_sheet_edits(mock_sheet)
@@ -31,7 +38,7 @@ class TestSheetsEditing(unittest.TestCase):
         mock_ws = Mock()
         
         # Mock sheet data with some user edits
-        mock_ws.get_all_records.return_value = [
+        mock_ws.get.return_value = sheet_rows([
             {
                 "Order ID": "12345",
                 "Seller": "TestSeller",
@@ -55,14 +62,14 @@ class TestSheetsEditing(unittest.TestCase):
                 "Item Description": "Brick 2 x 4",
                 "Total Lots": "5"  # User edit
             }
-        ]
+        ])
         
         with patch('sheets.get_or_create_worksheet', return_value=mock_ws):
             edits = read_orders_sheet_edits(mock_sheet)
             
             # Check that ALL fields are captured (new behavior)
             expected_edits = {
-                ("12345", ""): {
+                ("12345", ""): full_record({
                     "Order ID": "12345",
                     "Seller": "TestSeller",
                     "Order Date": "2024-01-01",
@@ -72,8 +79,8 @@ class TestSheetsEditing(unittest.TestCase):
                     "Tracking No": "1Z123456789",
                     "Item Number": "",
                     "Item Description": ""
-                },
-                ("12345", "3001"): {
+                }),
+                ("12345", "3001"): full_record({
                     "Order ID": "12345",
                     "Seller": "",
                     "Order Date": "",
@@ -84,10 +91,95 @@ class TestSheetsEditing(unittest.TestCase):
                     "Item Number": "3001",
                     "Item Description": "Brick 2 x 4",
                     "Total Lots": "5"
-                }
+                })
             }
             self.assertEqual(edits, expected_edits)
 
+    def test_read_orders_sheet_edits_reuses_unchanged_revision(self):
+        """Test that an unchanged spreadsheet revision skips the second download."""
+        mock_sheet = Mock()
+        mock_sheet.get_lastUpdateTime.return_value = "2024-01-01T00:00:00Z"
+        mock_ws = Mock()
+        mock_ws.get.return_value = sheet_rows([{"Order ID": "12345", "Item Number": ""}])
+
+        with patch('sheets.get_or_create_worksheet', return_value=mock_ws), \
+             patch('sheets.READ_CACHE_TTL_SECONDS', 0):
+            first = read_orders_sheet_edits(mock_sheet)
+            second = read_orders_sheet_edits(mock_sheet)
+            mock_ws.get.assert_called_once_with("A2:Q", value_render_option="UNFORMATTED_VALUE")
+            self.assertEqual(first, second)
+
+            mock_sheet.get_lastUpdateTime.return_value = "2024-01-02T00:00:00Z"
+            read_orders_sheet_edits(mock_sheet)
+            self.assertEqual(mock_ws.get.call_count, 2)
+
+    def test_revision_check_is_retried(self):
+        """Test that a rate-limited revision lookup is retried instead of failing the read."""
+        mock_sheet = Mock(id="revision-retry")
+        mock_sheet.get_lastUpdateTime.side_effect = [
+            gspread.exceptions.APIError(Mock(status_code=429)), "2024-01-01T00:00:00Z",
+        ]
+        mock_ws = Mock()
+        mock_ws.get.return_value = sheet_rows([{"Order ID": "12345", "Item Number": ""}])
+
+        with patch('sheets.get_or_create_worksheet', return_value=mock_ws), \
+             patch('sheets.time.sleep'):
+            edits = read_orders_sheet_edits(mock_sheet)
+
+        self.assertEqual(mock_sheet.get_lastUpdateTime.call_count, 2)
+        self.assertIn(("12345", ""), edits)
+
+    def test_read_orders_sheet_edits_cache_until_orders_written(self):
+        """Test that recent reads skip the revision check until the Orders sheet is rewritten."""
+        mock_sheet = Mock()
+        mock_ws = Mock(id=0, row_count=100, col_count=20)
+        mock_ws.get.return_value = sheet_rows([{"Order ID": "12345", "Item Number": ""}])
+
+        with patch('sheets.get_or_create_worksheet', return_value=mock_ws):
+            read_orders_sheet_edits(mock_sheet)
+            read_orders_sheet_edits(mock_sheet)
+            self.assertEqual(mock_sheet.get_lastUpdateTime.call_count, 1)
+            self.assertEqual(mock_ws.get.call_count, 1)
+
+            # update_orders_sheet reads through the cache, then drops it after writing
+            order = Order(order_id="12345", order_date="2024-01-01", seller="TestSeller",
+                          order_total=1.0, base_grand_total=1.0,
+                          items=[OrderItem(item_id="3001", item_type="P", color_id=4, qty=1, price=0.05)])
+            update_orders_sheet(mock_sheet, [order])
+            self.assertEqual(mock_ws.get.call_count, 1)
+            read_orders_sheet_edits(mock_sheet)
+            self.assertEqual(mock_ws.get.call_count, 2)
+
+    def test_prefetch_sheet_reads_fills_cache(self):
+        """Test that prefetched Orders rows are reused by read_orders_sheet_edits."""
+        mock_sheet = Mock()
+        mock_sheet.worksheets.return_value = []
+        mock_ws = Mock(id=0, row_count=100, col_count=20)
+        mock_ws.get.return_value = sheet_rows([{"Order ID": "12345", "Item Number": ""}])
+
+        with patch('sheets.get_worksheet', return_value=mock_ws) as mock_get_ws, \
+             patch('sheets.get_or_create_worksheet', return_value=mock_ws):
+            prefetch_sheet_reads(mock_sheet)
+            self.assertEqual(len({call.args[1] for call in mock_get_ws.call_args_list}), 4)
+            get_calls = mock_ws.get.call_count
+
+            edits = read_orders_sheet_edits(mock_sheet)
+            self.assertEqual(mock_ws.get.call_count, get_calls)
+            self.assertIn(("12345", ""), edits)
+
+    def test_prefetch_sheet_reads_skips_missing_tabs(self):
+        """Test that prefetching neither creates missing tabs nor hides unexpected errors."""
+        mock_sheet = Mock(id="prefetch-missing")
+        mock_sheet.worksheets.return_value = []
+        mock_sheet.worksheet.side_effect = WorksheetNotFound("Orders")
+
+        prefetch_sheet_reads(mock_sheet)
+        mock_sheet.add_worksheet.assert_not_called()
+
+        with patch('sheets.get_worksheet', side_effect=KeyError("bug")):
+            with self.assertRaises(KeyError):
+                prefetch_sheet_reads(mock_sheet)
+
     def test_read_orders_sheet_edits_handles_exceptions(self):
         """Test that read_orders_sheet_edits handles exceptions gracefully."""
         mock_sheet = Mock()
@@ -99,7 +191,7 @@ class TestSheetsEditing(unittest.TestCase):
     def test_update_orders_sheet_preserves_edits(self):
         """Test that update_orders_sheet preserves user edits."""
         mock_sheet = Mock()
-        mock_ws = Mock()
+        mock_ws = Mock(id=0, row_count=100, col_count=20)
         
         # Mock existing edits
         existing_edits = {
@@ -137,12 +229,11 @@ class TestSheetsEditing(unittest.TestCase):
             
             update_orders_sheet(mock_sheet, orders)
             
-            # Verify ws.update was called
-            self.assertTrue(mock_ws.update.called)
+            # Verify the sheet was written in a single batch update
+            mock_sheet.batch_update.assert_called_once()
             
             # Get the values that were written to the sheet
-            call_args = mock_ws.update.call_args
-            values = call_args[1]['values'] if 'values' in call_args[1] else call_args[0][0] if call_args[0] else None
+            values = written_values(mock_sheet)
             
             self.assertIsNotNone(values)
             self.assertTrue(len(values) > 1)  # Should have headers plus data
@@ -166,10 +257,39 @@ class TestSheetsEditing(unittest.TestCase):
             self.assertEqual(first_data_row[tracking_index], "1Z123456789")
             self.assertEqual(first_data_row[total_lots_index], "2")
 
+    def test_update_orders_sheet_keeps_edited_numbers_numeric(self):
+        """Test that numeric edits read back from the sheet are re-written as numbers."""
+        mock_sheet = Mock()
+        mock_ws = Mock(id=0, row_count=100, col_count=20)
+        # UNFORMATTED_VALUE reads return numbers, including numeric IDs
+        mock_ws.get.return_value = sheet_rows([
+            {"Order ID": 12345, "Shipping": 5.99, "Item Number": ""},
+            {"Item Number": 3001, "Each": 0.07},
+        ])
+        orders = [
+            Order(
+                order_id="12345",
+                order_date="2024-01-01T10:30:00.000Z",
+                seller="TestSeller",
+                order_total=0.5,
+                base_grand_total=0.5,
+                items=[OrderItem(item_id="3001", item_type="P", color_id=4, qty=10, price=0.05)]
+            )
+        ]
+
+        with patch('sheets.get_or_create_worksheet', return_value=mock_ws):
+            update_orders_sheet(mock_sheet, orders)
+
+        body = mock_sheet.batch_update.call_args[0][0]
+        rows = next(r["updateCells"]["rows"] for r in body["requests"] if "rows" in r.get("updateCells", {}))
+        first_row = rows[1]["values"]
+        self.assertEqual(first_row[ORDERS_HEADERS.index("Shipping")]["userEnteredValue"], {"numberValue": 5.99})
+        self.assertEqual(first_row[ORDERS_HEADERS.index("Each")]["userEnteredValue"], {"numberValue": 0.07})
+
     def test_update_orders_sheet_no_existing_edits(self):
         """Test update_orders_sheet works when there are no existing edits."""
         mock_sheet = Mock()
-        mock_ws = Mock()
+        mock_ws = Mock(id=0, row_count=100, col_count=20)
         
         # Create Order objects instead of dictionaries
         orders = [
@@ -199,7 +319,68 @@ class TestSheetsEditing(unittest.TestCase):
             update_orders_sheet(mock_sheet, orders)
             
             # Verify the function completes without error
-            self.assertTrue(mock_ws.update.called)
+            self.assertTrue(mock_sheet.batch_update.called)
+
+    def test_update_orders_sheet_single_batch_request(self):
+        """Test that the Orders sheet is cleared, written and formatted in one batch."""
+        mock_sheet = Mock(id="single-batch")
+        mock_ws = Mock(id=7, row_count=1, col_count=20)
+        mock_ws.title = "Orders"
+        config._WORKSHEETS[(mock_sheet.id, "Orders")] = mock_ws
+        orders = [
+            Order(
+                order_id="12345",
+                order_date="2024-01-01",
+                seller="TestSeller",
+                order_total=25.0,
+                base_grand_total=27.5,
+                items=[OrderItem(item_id="3001", item_type="P", color_id=4, qty=10,
+                                 price=2.5, condition="N", description="Test Brick")]
+            )
+        ]
+
+        with patch('sheets.read_orders_sheet_edits', return_value={}):
+            update_orders_sheet(mock_sheet, orders)
+
+        mock_ws.clear.assert_not_called()
+        mock_ws.update.assert_not_called()
+        # The resized tab's cached handle is stale, so it is resolved again next time
+        self.assertNotIn((mock_sheet.id, "Orders"), config._WORKSHEETS)
+        requests = mock_sheet.batch_update.call_args[0][0]["requests"]
+        kinds = [next(iter(request)) for request in requests]
+        self.assertEqual(kinds, ["updateSheetProperties", "updateCells", "updateCells"] + ["repeatCell"] * 2)
+        self.assertEqual(requests[0]["updateSheetProperties"]["properties"]["gridProperties"]["rowCount"], 2)
+        self.assertEqual(requests[3]["repeatCell"]["range"],
+                         {"sheetId": 7, "startRowIndex": 1, "endRowIndex": 2,
+                          "startColumnIndex": 3, "endColumnIndex": 7})
+        # Shipping..Base Grand Total (D:G) and Each..Total (P:Q) are merged runs
+        self.assertEqual(requests[4]["repeatCell"]["range"]["startColumnIndex"], 15)
+        self.assertEqual(requests[4]["repeatCell"]["range"]["endColumnIndex"], 17)
+
+    def test_update_orders_sheet_splits_large_payloads(self):
+        """Test that an oversized grid is written in ordered row chunks across batches."""
+        mock_sheet = Mock()
+        mock_ws = Mock(id=7, row_count=100, col_count=20)
+        items = [OrderItem(item_id=f"300{i}", item_type="P", color_id=4, qty=1, price=1.0)
+                 for i in range(3)]
+        orders = [Order(order_id="12345", order_date="2024-01-01", seller="TestSeller",
+                        order_total=3.0, base_grand_total=3.0, items=items)]
+
+        with patch('sheets.get_or_create_worksheet', return_value=mock_ws), \
+             patch('sheets.read_orders_sheet_edits', return_value={}), \
+             patch('sheets._MAX_BATCH_BYTES', 100), \
+             patch('sheets._WRITE_CHUNK_ROWS', 2):
+            update_orders_sheet(mock_sheet, orders)
+
+        batches = [call[0][0]["requests"] for call in mock_sheet.batch_update.call_args_list]
+        self.assertEqual([[next(iter(r)) for r in batch] for batch in batches], [
+            ["updateCells", "updateCells"],
+            ["updateCells", "repeatCell", "repeatCell"],
+        ])
+        self.assertEqual(batches[0][1]["updateCells"]["start"]["rowIndex"], 0)
+        self.assertEqual(len(batches[0][1]["updateCells"]["rows"]), 2)
+        self.assertEqual(batches[1][0]["updateCells"]["start"]["rowIndex"], 2)
+        self.assertEqual(len(batches[1][0]["updateCells"]["rows"]), 2)
 
     def test_read_orders_sheet_edits_handles_order_structure(self):
         """Test reading edits from sheet with proper order structure (empty Order ID for item rows)."""
@@ -207,7 +388,7 @@ class TestSheetsEditing(unittest.TestCase):
         mock_ws = Mock()
         
         # Mock sheet data mimicking the real structure where item rows have empty Order IDs
-        mock_ws.get_all_records.return_value = [
+        mock_ws.get.return_value = sheet_rows([
             {
                 "Order ID": "12345",  # Order header has Order ID
                 "Seller": "TestSeller",
@@ -241,7 +422,7 @@ class TestSheetsEditing(unittest.TestCase):
                 "Qty": "5",
                 "Each": "2.00"
             }
-        ]
+        ])
         
         with patch('sheets.get_or_create_worksheet', return_value=mock_ws):
             edits = read_orders_sheet_edits(mock_sheet)
@@ -0,0 +1,108 @@
+import os
+import sys
+import unittest
+from unittest.mock import Mock, patch
+
+# Allow importing modules from the scripts directory
+CURRENT_DIR = os.path.dirname(__file__)
+SCRIPTS_DIR = os.path.abspath(os.path.join(CURRENT_DIR, '..', 'scripts'))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from sheets import _cell_data, update_summary  # noqa: E402
+
+
+class TestCellData(unittest.TestCase):
+
+    def test_user_entered_numeric_strings(self):
+        """Plain and currency-formatted numbers become numberValue."""
+        for text, number in [("10", 10.0), ("$2.50", 2.5), ("-$1,234.50", -1234.5), ("1234.5", 1234.5)]:
+            self.assertEqual(_cell_data(text, user_entered=True),
+                             {"userEnteredValue": {"numberValue": number}})
+
+    def test_user_entered_non_numeric_strings_stay_text(self):
+        """Strings float() accepts but USER_ENTERED does not stay text."""
+        for text in ["nan", "inf", "-Infinity", "1_000", "1,23", " 12"]:
+            self.assertEqual(_cell_data(text, user_entered=True),
+                             {"userEnteredValue": {"stringValue": text}})
+
+    def test_non_finite_floats_are_sent_as_text(self):
+        """NaN and infinity are not valid JSON numbers."""
+        self.assertEqual(_cell_data(float("nan")), {"userEnteredValue": {"stringValue": "nan"}})
+        self.assertEqual(_cell_data(float("inf")), {"userEnteredValue": {"stringValue": "inf"}})
+
+
+class TestUpdateSummary(unittest.TestCase):
+
+    def _summary_rows(self):
+        return [
+            ["Fig A", 2, 3.5, "", "", "", "", "", "", "", ""],
+            ["Fig B", 1, 4.0, "", "", "", "", "", "", "", ""],
+        ]
+
+    def test_existing_prices_are_preserved(self):
+        """Prices already entered in column D are carried over by Minifig ID."""
+        mock_sheet = Mock()
+        mock_ws = Mock(id=3, row_count=100, col_count=20)
+        # Column-major read of A2:D
+        mock_ws.get.return_value = [["Fig B", "Fig A"], [], [], [19.99, ""]]
+
+        rows = self._summary_rows()
+        with patch('sheets.get_or_create_worksheet', return_value=mock_ws):
+            update_summary(mock_sheet, rows)
+
+        mock_ws.get.assert_called_once_with("A2:D", major_dimension="COLUMNS",
+                                            value_render_option="UNFORMATTED_VALUE")
+        self.assertEqual(rows[0][3], "=14.99")  # blank price falls back to default
+        self.assertEqual(rows[1][3], 19.99)
+
+    def test_empty_sheet_uses_default_price(self):
+        """A fresh Summary sheet yields the default price for every row."""
+        mock_sheet = Mock()
+        mock_ws = Mock(id=3, row_count=100, col_count=20)
+        mock_ws.get.return_value = []
+
+        rows = self._summary_rows()
+        with patch('sheets.get_or_create_worksheet', return_value=mock_ws):
+            update_summary(mock_sheet, rows)
+
+        self.assertEqual([row[3] for row in rows], ["=14.99", "=14.99"])
+
+    def test_summary_written_in_single_batch(self):
+        """Headers, data, formulas and number formats go out in one batchUpdate."""
+        mock_sheet = Mock()
+        mock_ws = Mock(id=3, row_count=100, col_count=20)
+        mock_ws.get.return_value = [["Fig A"], [], [], ["19.99"]]
+
+        with patch('sheets.get_or_create_worksheet', return_value=mock_ws):
+            update_summary(mock_sheet, self._summary_rows())
+
+        mock_ws.update.assert_not_called()
+        mock_ws.update_cells.assert_not_called()
+        mock_ws.format.assert_not_called()
+        mock_sheet.batch_update.assert_called_once()
+
+        requests = mock_sheet.batch_update.call_args[0][0]["requests"]
+        self.assertEqual([next(iter(r)) for r in requests], ["updateCells"] + ["repeatCell"] * 7)
+
+        rows = requests[0]["updateCells"]["rows"]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["values"][7], {"userEnteredValue": {"stringValue": "75%"}})
+        first = rows[1]["values"]
+        self.assertEqual(len(first), 4)
+        self.assertEqual(first[0], {"userEnteredValue": {"stringValue": "Fig A"}})
+        self.assertEqual(first[3], {"userEnteredValue": {"numberValue": 19.99}})
+        self.assertEqual(rows[2]["values"][3], {"userEnteredValue": {"formulaValue": "=14.99"}})
+
+        # Each formula column is sent once as a row-2 pattern covering every data row
+        profit = requests[1]["repeatCell"]
+        self.assertEqual(profit["cell"], {"userEnteredValue": {
+            "formulaValue": "=ROUND((D2 * 0.85) - C2 - Config!$B$1 - Config!$B$2, 2)"}})
+        self.assertEqual(profit["range"], {"sheetId": 3, "startRowIndex": 1, "endRowIndex": 3,
+                                           "startColumnIndex": 4, "endColumnIndex": 5})
+        price_175 = requests[4]["repeatCell"]
+        self.assertEqual(price_175["cell"]["userEnteredFormat"]["numberFormat"]["type"], "CURRENCY")
+        self.assertEqual(price_175["fields"], "userEnteredValue,userEnteredFormat.numberFormat")
+
+if __name__ == '__main__':
+    unittest.main()